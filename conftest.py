@@ -0,0 +1,2 @@
+# skills/pptx/ooxml is a symlink to skills/docx/ooxml; collect its tests once
+collect_ignore = ["skills/pptx/ooxml"]
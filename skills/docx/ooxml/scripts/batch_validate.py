@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Validate many Office documents in one run, across worker processes.
+
+Each worker keeps its compiled XSD schemas for the whole run, so a schema
+is compiled once per worker instead of once per document. One JSON line is
+written per document, in input order, followed by throughput statistics
+on stderr.
+
+Usage:
+    python batch_validate.py "<glob>" [<glob> ...] [--originals <dir>] [--jobs N]
+    python batch_validate.py --pairs <file> [--jobs N] [--output results.jsonl]
+
+Documents matched by a glob may be Office files or unpacked directories.
+Each one is compared against the file of the same name in --originals;
+without it an Office file is its own original, which runs every structural
+check but treats XSD errors already in the file as pre-existing.
+
+A --pairs file lists one "<document>\\t<original>" pair per line.
+
+With --xsd-cache, XSD results are shared across documents through an
+on-disk cache, so parts common to many documents (styles, themes, slide
+masters from one template) are validated once; its hit rate is added to
+the statistics.
+"""
+
+import argparse
+import contextlib
+import functools
+import glob
+import io
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from validate import get_validators, run_validators
+from validation import ValidationReport, XSDResultCache
+
+# XSD result cache of this process, opened on first use by open_xsd_cache
+_xsd_cache = None
+
+
+def open_xsd_cache(path):
+    """Return this process's XSDResultCache, opening it on first use.
+
+    It stays open for the rest of the run and is closed when the process exits.
+    """
+    global _xsd_cache
+    if _xsd_cache is None:
+        _xsd_cache = XSDResultCache(path)
+        _xsd_cache.close_at_exit()
+    return _xsd_cache
+
+
+def read_pairs(pairs_file):
+    """Return the (document, original) pairs listed in a tab-separated file.
+
+    Raises ValueError naming the lines that are not such a pair.
+    """
+    pairs = []
+    malformed = []
+    lines = Path(pairs_file).read_text(encoding="utf-8").splitlines()
+    for number, line in enumerate(lines, 1):
+        if line.strip() and not line.startswith("#"):
+            document, tab, original = line.partition("\t")
+            if not (tab and document and original):
+                malformed.append(number)
+                continue
+            pairs.append((document, original))
+    if malformed:
+        raise ValueError(
+            f"{pairs_file}: expected <document><TAB><original> on line(s) "
+            + ", ".join(map(str, malformed))
+        )
+    return pairs
+
+
+def glob_pairs(patterns, originals_dir=None):
+    """Return (document, original) pairs for every document matching the globs."""
+    pairs = []
+    for pattern in patterns:
+        for document in sorted(glob.glob(pattern, recursive=True)):
+            name = Path(document).name
+            if originals_dir is None:
+                original = document
+            elif Path(document).is_dir():
+                # An unpacked directory is named after its original, minus the suffix
+                matches = sorted(Path(originals_dir).glob(f"{glob.escape(name)}.*"))
+                original = matches[0] if matches else Path(originals_dir) / name
+            else:
+                original = Path(originals_dir) / name
+            pairs.append((document, str(original)))
+    return pairs
+
+
+def validate_document(pair, authors=None, xsd_cache_path=None):
+    """Validate one document and return its result as a JSON-serializable dict."""
+    document, original = pair
+    start = time.perf_counter()
+    report = ValidationReport()
+    result = {"document": document, "original": original}
+    xsd_cache = None
+    if xsd_cache_path is not None:
+        xsd_cache = open_xsd_cache(xsd_cache_path)
+        hits, misses = xsd_cache.hits, xsd_cache.misses
+    try:
+        validators = get_validators(Path(original).suffix.lower())
+        if validators is None:
+            raise ValueError(f"Validation not supported for {original}")
+        # Validators print as they go; keep that out of the JSON output
+        with contextlib.redirect_stdout(io.StringIO()):
+            passed = run_validators(
+                validators,
+                document,
+                original,
+                report,
+                authors=authors,
+                xsd_cache=xsd_cache,
+            )
+        result.update(report.to_dict(), passed=passed)
+    except Exception as e:
+        result.update(passed=False, error=f"{type(e).__name__}: {e}")
+    if xsd_cache is not None:
+        result["xsd_cache"] = {
+            "hits": xsd_cache.hits - hits,
+            "misses": xsd_cache.misses - misses,
+        }
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def iter_results(pairs, jobs, authors=None, xsd_cache_path=None):
+    """Validate each pair, yielding results in input order."""
+    validate = functools.partial(
+        validate_document, authors=authors, xsd_cache_path=xsd_cache_path
+    )
+    if jobs > 1 and len(pairs) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from executor.map(validate, pairs)
+    else:
+        yield from map(validate, pairs)
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate many Office documents in one run"
+    )
+    parser.add_argument(
+        "patterns",
+        nargs="*",
+        help="Globs matching Office files or unpacked document directories",
+    )
+    parser.add_argument(
+        "--originals",
+        help="Directory holding the original file of each matched document",
+    )
+    parser.add_argument(
+        "--pairs",
+        help='File listing one "<document>\\t<original>" pair per line',
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--author",
+        action="append",
+        dest="authors",
+        help="Author whose tracked changes are validated; repeat for several "
+        "(default: Claude)",
+    )
+    parser.add_argument(
+        "--xsd-cache",
+        help="SQLite file caching XSD results across documents and runs "
+        "(created if missing)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Write JSON lines to this file instead of stdout",
+    )
+    args = parser.parse_args()
+
+    if args.pairs:
+        try:
+            pairs = read_pairs(args.pairs)
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+    elif args.patterns:
+        pairs = glob_pairs(args.patterns, args.originals)
+    else:
+        parser.error("give one or more globs, or --pairs")
+    if not pairs:
+        print("Error: No documents to validate", file=sys.stderr)
+        sys.exit(1)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    latencies = []
+    failed = 0
+    cache_hits = cache_misses = 0
+    start = time.perf_counter()
+    try:
+        for result in iter_results(pairs, args.jobs, args.authors, args.xsd_cache):
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            latencies.append(result["seconds"])
+            failed += not result["passed"]
+            if "xsd_cache" in result:
+                cache_hits += result["xsd_cache"]["hits"]
+                cache_misses += result["xsd_cache"]["misses"]
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(
+        f"Validated {len(pairs)} documents ({failed} failed) in {elapsed:.2f}s: "
+        f"{len(pairs) / elapsed:.1f} docs/sec, "
+        f"p50 {percentile(latencies, 0.50) * 1000:.1f} ms, "
+        f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms",
+        file=sys.stderr,
+    )
+    if args.xsd_cache:
+        lookups = cache_hits + cache_misses
+        print(
+            f"XSD cache: {cache_hits} hits, {cache_misses} misses "
+            f"({cache_hits / lookups if lookups else 0:.0%} hit rate)",
+            file=sys.stderr,
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
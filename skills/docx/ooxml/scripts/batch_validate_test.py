@@ -0,0 +1,144 @@
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import batch_validate
+from batch_validate import glob_pairs, iter_results, percentile, read_pairs
+from validation_test import paragraph, write_package, zip_package
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPercentile(unittest.TestCase):
+
+    def test_single_value_is_every_percentile(self):
+        for fraction in [0.0, 0.5, 0.95, 1.0]:
+            self.assertEqual(percentile([7], fraction), 7)
+
+    def test_nearest_rank(self):
+        values = list(range(1, 21))
+        self.assertEqual(percentile(values, 0.50), 10)
+        self.assertEqual(percentile(values, 0.95), 19)
+        self.assertEqual(percentile(values, 1.0), 20)
+        self.assertEqual(percentile(values, 0.0), 1)
+        self.assertEqual(percentile([1, 2, 3, 4], 0.50), 2)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPairs(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+
+    def test_read_pairs_skips_comments_and_blank_lines(self):
+        pairs_file = self.root / "pairs.tsv"
+        pairs_file.write_text(
+            "# document\toriginal\n\na.docx\toriginals/a.docx\n"
+            "   \nb\toriginals/b\tx.docx\n",
+            encoding="utf-8",
+        )
+        self.assertEqual(
+            read_pairs(pairs_file),
+            [("a.docx", "originals/a.docx"), ("b", "originals/b\tx.docx")],
+        )
+
+    def test_read_pairs_names_lines_without_a_pair(self):
+        pairs_file = self.root / "pairs.tsv"
+        pairs_file.write_text(
+            "a.docx\toriginals/a.docx\nb.docx originals/b.docx\n\tc.docx\nd.docx\t\n",
+            encoding="utf-8",
+        )
+        with self.assertRaisesRegex(ValueError, r"line\(s\) 2, 3, 4$"):
+            read_pairs(pairs_file)
+
+    def test_glob_pairs_matches_files_and_directories_to_originals(self):
+        docs, originals = self.root / "docs", self.root / "originals"
+        (docs / "report").mkdir(parents=True)
+        (docs / "notes.docx").write_bytes(b"")
+        originals.mkdir()
+        (originals / "report.docx").write_bytes(b"")
+
+        pattern = str(docs / "*")
+        self.assertEqual(
+            glob_pairs([pattern]),
+            [
+                (str(docs / "notes.docx"), str(docs / "notes.docx")),
+                (str(docs / "report"), str(docs / "report")),
+            ],
+        )
+        self.assertEqual(
+            glob_pairs([pattern], originals),
+            [
+                (str(docs / "notes.docx"), str(originals / "notes.docx")),
+                (str(docs / "report"), str(originals / "report.docx")),
+            ],
+        )
+        # A directory without an original of any suffix keeps its bare name
+        (originals / "report.docx").unlink()
+        self.assertEqual(
+            glob_pairs([str(docs / "report")], originals),
+            [(str(docs / "report"), str(originals / "report"))],
+        )
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestBatchValidate(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.pairs = []
+        for name, body in [
+            ("bad", paragraph("Hello") + "<w:bogus/>"),
+            ("good", paragraph("Hello")),
+            ("also-good", paragraph("Hello")),
+        ]:
+            original_dir = write_package(
+                self.root / "originals" / name, paragraph("Hello")
+            )
+            original_file = zip_package(original_dir, self.root / f"{name}.docx")
+            unpacked_dir = write_package(self.root / "docs" / name, body)
+            self.pairs.append((str(unpacked_dir), str(original_file)))
+
+    def test_parallel_results_come_back_in_input_order(self):
+        results = list(iter_results(self.pairs, jobs=2))
+        self.assertEqual(
+            [(r["document"], r["original"]) for r in results], self.pairs
+        )
+        self.assertEqual([r["passed"] for r in results], [False, True, True])
+
+    def test_unusable_xsd_cache_does_not_turn_results_into_errors(self):
+        results = list(iter_results(self.pairs, jobs=2, xsd_cache_path=str(self.root)))
+        self.assertEqual([r["passed"] for r in results], [False, True, True])
+        for result in results:
+            self.assertNotIn("error", result)
+            self.assertEqual(result["xsd_cache"]["hits"], 0)
+
+    def test_main_writes_json_lines_in_order_and_fails_if_any_document_does(self):
+        pairs_file = self.root / "pairs.tsv"
+        pairs_file.write_text(
+            "".join(f"{document}\t{original}\n" for document, original in self.pairs),
+            encoding="utf-8",
+        )
+        output_file = self.root / "results.jsonl"
+        argv = ["batch_validate.py", "--pairs", str(pairs_file), "--jobs", "2"]
+        argv += ["--output", str(output_file)]
+        with mock.patch("sys.argv", argv), contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit) as exit_info:
+                batch_validate.main()
+        self.assertEqual(exit_info.exception.code, 1)
+
+        lines = output_file.read_text(encoding="utf-8").splitlines()
+        results = [json.loads(line) for line in lines]
+        self.assertEqual([r["document"] for r in results], [d for d, _ in self.pairs])
+        self.assertEqual([r["passed"] for r in results], [False, True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the OOXML tooling.
+
+Each benchmark runs against a synthetic package generated on the fly, or
+against a real unpacked document when one is given.
+
+Usage:
+    python benchmark.py xsd [--slides 300] [--unpacked <dir> --original <file>]
+    python benchmark.py redlining [--changes 10000] [--save <dir>]
+    python benchmark.py pack [--slides 300] [--images 20] [--unpacked <dir>]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pack
+import validation.schemas
+from validation import PPTXSchemaValidator, RedliningValidator
+
+CONTENT_TYPES_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+PACKAGE_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+OFFICE_RELS_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PML_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+DML_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+CHART_NS = "http://schemas.openxmlformats.org/drawingml/2006/chart"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+WML_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def make_synthetic_pptx(output_dir, slides):
+    """Write an unpacked presentation with the given number of slides."""
+    output_dir = Path(output_dir)
+    for sub in ["_rels", "ppt/_rels", "ppt/slides/_rels"]:
+        (output_dir / sub).mkdir(parents=True, exist_ok=True)
+
+    overrides = [
+        '<Override PartName="/ppt/presentation.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.presentationml.presentation.main+xml"/>'
+    ]
+    slide_ids = []
+    presentation_rels = []
+    for n in range(1, slides + 1):
+        overrides.append(
+            f'<Override PartName="/ppt/slides/slide{n}.xml" ContentType="application/'
+            f'vnd.openxmlformats-officedocument.presentationml.slide+xml"/>'
+        )
+        slide_ids.append(f'<p:sldId id="{255 + n}" r:id="rId{n}"/>')
+        presentation_rels.append(
+            f'<Relationship Id="rId{n}" Type="{REL_TYPE}/slide" Target="slides/slide{n}.xml"/>'
+        )
+        (output_dir / f"ppt/slides/slide{n}.xml").write_text(
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<p:sld xmlns:a="{DML_NS}" xmlns:r="{OFFICE_RELS_NS}" xmlns:p="{PML_NS}">'
+            f"<p:cSld><p:spTree>"
+            f'<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+            f"<p:grpSpPr/>"
+            f'<p:sp><p:nvSpPr><p:cNvPr id="2" name="Title {n}"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+            f"<p:spPr/><p:txBody><a:bodyPr/><a:p><a:r><a:t>Slide {n}</a:t></a:r></a:p></p:txBody></p:sp>"
+            f"</p:spTree></p:cSld></p:sld>",
+            encoding="utf-8",
+        )
+        (output_dir / f"ppt/slides/_rels/slide{n}.xml.rels").write_text(
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="{PACKAGE_RELS_NS}"/>',
+            encoding="utf-8",
+        )
+
+    (output_dir / "[Content_Types].xml").write_text(
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<Types xmlns="{CONTENT_TYPES_NS}">'
+        f'<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        f'<Default Extension="xml" ContentType="application/xml"/>'
+        f"{''.join(overrides)}</Types>",
+        encoding="utf-8",
+    )
+    (output_dir / "_rels/.rels").write_text(
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<Relationships xmlns="{PACKAGE_RELS_NS}">'
+        f'<Relationship Id="rId1" Type="{REL_TYPE}/officeDocument" Target="ppt/presentation.xml"/>'
+        f"</Relationships>",
+        encoding="utf-8",
+    )
+    (output_dir / "ppt/presentation.xml").write_text(
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<p:presentation xmlns:a="{DML_NS}" xmlns:r="{OFFICE_RELS_NS}" xmlns:p="{PML_NS}">'
+        f"<p:sldIdLst>{''.join(slide_ids)}</p:sldIdLst>"
+        f'<p:sldSz cx="9144000" cy="6858000"/><p:notesSz cx="6858000" cy="9144000"/>'
+        f"</p:presentation>",
+        encoding="utf-8",
+    )
+    (output_dir / "ppt/_rels/presentation.xml.rels").write_text(
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<Relationships xmlns="{PACKAGE_RELS_NS}">{"".join(presentation_rels)}</Relationships>',
+        encoding="utf-8",
+    )
+
+
+def add_synthetic_images(output_dir, images, image_size):
+    """Add incompressible stand-ins for PNG images to an unpacked presentation."""
+    media_dir = Path(output_dir) / "ppt/media"
+    media_dir.mkdir(parents=True, exist_ok=True)
+    for n in range(1, images + 1):
+        (media_dir / f"image{n}.png").write_bytes(os.urandom(image_size))
+    content_types = Path(output_dir) / "[Content_Types].xml"
+    png_default = '<Default Extension="png" ContentType="image/png"/>'
+    content_types.write_text(
+        content_types.read_text(encoding="utf-8").replace(
+            "<Default ", f"{png_default}<Default ", 1
+        ),
+        encoding="utf-8",
+    )
+
+
+def add_synthetic_charts(output_dir):
+    """Give each slide of an unpacked presentation a bar chart part of its own.
+
+    Slides have no schema of their own in the validator, while charts are
+    validated against dml-chart.xsd, so they give XSD timings real parts to check.
+    """
+    output_dir = Path(output_dir)
+    (output_dir / "ppt/charts").mkdir(parents=True, exist_ok=True)
+    overrides = []
+    for slide_rels in sorted((output_dir / "ppt/slides/_rels").glob("slide*.xml.rels")):
+        n = int(slide_rels.name[len("slide") : -len(".xml.rels")])
+        (output_dir / f"ppt/charts/chart{n}.xml").write_text(
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<c:chartSpace xmlns:c="{CHART_NS}" xmlns:a="{DML_NS}" xmlns:r="{OFFICE_RELS_NS}">'
+            f"<c:chart><c:plotArea><c:layout/>"
+            f'<c:barChart><c:barDir val="col"/><c:grouping val="clustered"/>'
+            f'<c:ser><c:idx val="0"/><c:order val="0"/><c:tx><c:v>Series {n}</c:v></c:tx>'
+            f'<c:cat><c:strLit><c:ptCount val="2"/><c:pt idx="0"><c:v>A</c:v></c:pt>'
+            f'<c:pt idx="1"><c:v>B</c:v></c:pt></c:strLit></c:cat>'
+            f'<c:val><c:numLit><c:ptCount val="2"/><c:pt idx="0"><c:v>{n}</c:v></c:pt>'
+            f'<c:pt idx="1"><c:v>{n * 2}</c:v></c:pt></c:numLit></c:val></c:ser>'
+            f'<c:axId val="1"/><c:axId val="2"/></c:barChart>'
+            f'<c:catAx><c:axId val="1"/><c:scaling/><c:axPos val="b"/><c:crossAx val="2"/></c:catAx>'
+            f'<c:valAx><c:axId val="2"/><c:scaling/><c:axPos val="l"/><c:crossAx val="1"/></c:valAx>'
+            f"</c:plotArea></c:chart></c:chartSpace>",
+            encoding="utf-8",
+        )
+        slide_rels.write_text(
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="{PACKAGE_RELS_NS}">'
+            f'<Relationship Id="rId1" Type="{REL_TYPE}/chart" Target="../charts/chart{n}.xml"/>'
+            f"</Relationships>",
+            encoding="utf-8",
+        )
+        overrides.append(
+            f'<Override PartName="/ppt/charts/chart{n}.xml" ContentType="application/'
+            f'vnd.openxmlformats-officedocument.drawingml.chart+xml"/>'
+        )
+    content_types = output_dir / "[Content_Types].xml"
+    content_types.write_text(
+        content_types.read_text(encoding="utf-8").replace(
+            "</Types>", f"{''.join(overrides)}</Types>"
+        ),
+        encoding="utf-8",
+    )
+
+
+def make_tracked_changes_docx(output_dir, original_file, changes, per_paragraph=1000):
+    """Write an unpacked docx with the given number of tracked changes by Claude.
+
+    Changes come in deletion/insertion pairs, per_paragraph to a paragraph, with
+    a change by another author in between. original_file gets the same
+    document with Claude's changes rejected.
+    """
+    output_dir = Path(output_dir)
+    (output_dir / "word").mkdir(parents=True, exist_ok=True)
+    modified, original = [], []
+    for p in range(0, changes, per_paragraph):
+        runs, original_runs = [], []
+        for n in range(p, min(p + per_paragraph, changes), 2):
+            change = f'w:id="{n}" w:date="2025-01-01T00:00:00Z"'
+            runs.append(
+                f'<w:r><w:t xml:space="preserve">clause {n} </w:t></w:r>'
+                f'<w:del {change} w:author="Claude"><w:r><w:delText>old {n}</w:delText></w:r></w:del>'
+                f'<w:ins w:id="{n + 1}" w:author="Claude"><w:r><w:t>new {n}</w:t></w:r></w:ins>'
+                f'<w:ins w:id="{n}0" w:author="Reviewer"><w:r><w:t>; </w:t></w:r></w:ins>'
+            )
+            original_runs.append(
+                f'<w:r><w:t xml:space="preserve">clause {n} </w:t></w:r>'
+                f"<w:r><w:t>old {n}</w:t></w:r>"
+                f'<w:ins w:id="{n}0" w:author="Reviewer"><w:r><w:t>; </w:t></w:r></w:ins>'
+            )
+        modified.append(f"<w:p>{''.join(runs)}</w:p>")
+        original.append(f"<w:p>{''.join(original_runs)}</w:p>")
+
+    def document(paragraphs):
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<w:document xmlns:w="{WML_NS}"><w:body>{"".join(paragraphs)}</w:body></w:document>'
+        )
+
+    (output_dir / "word/document.xml").write_text(document(modified), encoding="utf-8")
+    with zipfile.ZipFile(original_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("word/document.xml", document(original))
+
+
+def zip_directory(input_dir, output_file):
+    """Zip an unpacked directory as-is, for use as an original baseline."""
+    input_dir = Path(input_dir)
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        for f in sorted(input_dir.rglob("*")):
+            if f.is_file():
+                zf.write(f, f.relative_to(input_dir))
+
+
+def time_per_file(validator, compile_each_time):
+    """Time validate_file_against_xsd for each part, returning seconds per file."""
+    timings = []
+    for xml_file in validator.xml_files:
+        if compile_each_time:
+            validation.schemas._COMPILED_SCHEMAS.clear()
+        start = time.perf_counter()
+        validator.validate_file_against_xsd(xml_file)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label, timings):
+    print(
+        f"  {label:<28} files={len(timings):<5} "
+        f"total={sum(timings):8.3f}s  "
+        f"mean={statistics.mean(timings) * 1000:8.2f}ms  "
+        f"p95={sorted(timings)[int(len(timings) * 0.95)] * 1000:8.2f}ms"
+    )
+
+
+def bench_xsd(args):
+    """Per-file XSD validation time with and without the compiled-schema registry.
+
+    The synthetic deck gets a chart per slide, as slides themselves are not
+    schema-validated.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.unpacked:
+            unpacked_dir, original_file = Path(args.unpacked), Path(args.original)
+        else:
+            unpacked_dir = Path(temp_dir) / "unpacked"
+            original_file = Path(temp_dir) / "original.pptx"
+            make_synthetic_pptx(unpacked_dir, args.slides)
+            add_synthetic_charts(unpacked_dir)
+            zip_directory(unpacked_dir, original_file)
+
+        validator = PPTXSchemaValidator(unpacked_dir, original_file)
+        with_schema = [f for f in validator.xml_files if validator._get_schema_path(f)]
+        print(
+            f"XSD validation of {len(validator.xml_files)} parts in {unpacked_dir}, "
+            f"{len(with_schema)} with a schema"
+        )
+        report("compile per file (before)", time_per_file(validator, True))
+
+        validation.schemas._COMPILED_SCHEMAS.clear()
+        validator = PPTXSchemaValidator(unpacked_dir, original_file)
+        report("shared registry (after)", time_per_file(validator, False))
+
+
+def bench_redlining(args):
+    """Tracked-change stripping and redlining validation time by document size.
+
+    Time per change should stay flat as the document grows, and peak memory
+    of the streaming comparison should stay flat too.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        save_dir = Path(args.save) if args.save else Path(temp_dir)
+        print(f"Redlining validation, {args.per_paragraph} changes per paragraph")
+        for changes in [args.changes // 4, args.changes // 2, args.changes]:
+            unpacked_dir = save_dir / f"changes{changes}"
+            original_file = save_dir / f"changes{changes}-original.docx"
+            make_tracked_changes_docx(
+                unpacked_dir, original_file, changes, args.per_paragraph
+            )
+            validator = RedliningValidator(unpacked_dir, original_file)
+
+            root = ElementTree.parse(unpacked_dir / "word/document.xml").getroot()
+            start = time.perf_counter()
+            validator._remove_tracked_changes(root)
+            strip = time.perf_counter() - start
+            print(
+                f"  changes={changes:<7} strip={strip * 1000:9.2f}ms "
+                f"({strip / changes * 1e6:6.2f}us/change)"
+            )
+
+            for streaming in [False, True]:
+                validator = RedliningValidator(
+                    unpacked_dir, original_file, streaming=streaming
+                )
+                tracemalloc.start()
+                start = time.perf_counter()
+                assert validator.validate(), "synthetic document should pass"
+                total = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                label = "streaming" if streaming else "trees"
+                print(
+                    f"    validate ({label:<9}) {total * 1000:9.2f}ms  "
+                    f"peak={peak / 2**20:8.1f}MB"
+                )
+
+
+def bench_pack(args):
+    """Pack time and size, deflating every part versus storing compressed media.
+
+    The last run condenses the XML parts over args.jobs processes.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.unpacked:
+            unpacked_dir = Path(args.unpacked)
+        else:
+            unpacked_dir = Path(temp_dir) / "unpacked"
+            make_synthetic_pptx(unpacked_dir, args.slides)
+            add_synthetic_images(
+                unpacked_dir, args.images, int(args.image_mb * 2**20)
+            )
+        output_file = Path(temp_dir) / "packed.pptx"
+        print(f"Packing {unpacked_dir}")
+
+        stored_extensions = pack.STORED_EXTENSIONS
+        runs = [("deflate all (before)", set(), None, 1)]
+        runs += [
+            (f"store media, level {level or 'default'}", stored_extensions, level, 1)
+            for level in [1, None, 9]
+        ]
+        runs.append(
+            (f"store media, {args.jobs} jobs", stored_extensions, None, args.jobs)
+        )
+        try:
+            for label, extensions, level, jobs in runs:
+                pack.STORED_EXTENSIONS = extensions
+                timings = []
+                for _ in range(3):
+                    start = time.perf_counter()
+                    pack.pack_document(
+                        unpacked_dir, output_file, compresslevel=level, jobs=jobs
+                    )
+                    timings.append(time.perf_counter() - start)
+                print(
+                    f"  {label:<28} best={min(timings) * 1000:9.1f}ms  "
+                    f"size={output_file.stat().st_size / 2**20:9.2f}MB"
+                )
+        finally:
+            pack.STORED_EXTENSIONS = stored_extensions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the OOXML tooling")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    xsd = subparsers.add_parser("xsd", help="Per-file XSD validation time")
+    xsd.add_argument(
+        "--slides", type=int, default=300, help="Synthetic slide count, a chart each"
+    )
+    xsd.add_argument("--unpacked", help="Use a real unpacked document instead")
+    xsd.add_argument("--original", help="Original file for --unpacked")
+    xsd.set_defaults(func=bench_xsd)
+
+    redlining = subparsers.add_parser(
+        "redlining", help="Tracked-change stripping time by document size"
+    )
+    redlining.add_argument(
+        "--changes", type=int, default=10000, help="Tracked changes in the largest run"
+    )
+    redlining.add_argument(
+        "--per-paragraph", type=int, default=1000, help="Tracked changes per paragraph"
+    )
+    redlining.add_argument("--save", help="Keep the generated documents in this directory")
+    redlining.set_defaults(func=bench_redlining)
+
+    pack_parser = subparsers.add_parser(
+        "pack", help="Pack time and size with and without stored media"
+    )
+    pack_parser.add_argument(
+        "--slides", type=int, default=300, help="Synthetic slide count"
+    )
+    pack_parser.add_argument(
+        "--images", type=int, default=20, help="Synthetic image count"
+    )
+    pack_parser.add_argument(
+        "--image-mb", type=float, default=5, help="Size of each synthetic image"
+    )
+    pack_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for the parallel run (default: number of CPUs)",
+    )
+    pack_parser.add_argument("--unpacked", help="Pack a real unpacked document instead")
+    pack_parser.set_defaults(func=bench_pack)
+
+    args = parser.parse_args()
+    if args.benchmark == "xsd" and args.unpacked and not args.original:
+        parser.error("--unpacked requires --original")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,29 +3,77 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--compress-level N]
+        [--jobs N]
 """
 
 import argparse
-import shutil
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
 import zipfile
 from pathlib import Path
 
+import lxml.etree
+from defusedxml import EntitiesForbidden
+
+# Media formats that are compressed already, stored as is since deflating
+# them again costs time for next to no gain. Uncompressed formats such as
+# EMF/WMF metafiles, BMP and TIFF shrink well and are deflated like XML.
+STORED_EXTENSIONS = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".jfif",
+    ".gif",
+    ".webp",
+    ".wdp",
+    ".emz",
+    ".wmz",
+    ".mp3",
+    ".m4a",
+    ".wma",
+    ".mp4",
+    ".m4v",
+    ".mov",
+    ".wmv",
+    ".avi",
+    ".zip",
+    ".docx",
+    ".xlsx",
+    ".pptx",
+}
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        choices=range(10),
+        metavar="N",
+        help="Deflate level 0-9 for XML and other uncompressed parts "
+        "(default: zlib's default, 6)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for condensing XML (default: 1)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            compresslevel=args.compress_level,
+            jobs=args.jobs,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +90,17 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, compresslevel=None, jobs=1):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        compresslevel: Deflate level 0-9 for the parts that are not stored as is
+            (default: zlib's default)
+        jobs: Number of worker processes condensing XML parts (default: 1); the
+            file written is the same for any number
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,28 +113,39 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    # Write the Office file straight from input_dir, leaving it unmodified:
+    # XML parts are condensed in memory, everything else is streamed as is
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    skip = output_file.resolve()  # In case it is written inside input_dir
+    members = sorted(
+        (f.relative_to(input_dir).as_posix(), f)
+        for f in input_dir.rglob("*")
+        if f.is_file() and f.resolve() != skip
+    )
+    # [Content_Types].xml goes first, as in the packages Office writes
+    members.sort(key=lambda member: member[0] != "[Content_Types].xml")
+
+    xml_files = [f for _, f in members if f.name.endswith((".xml", ".rels"))]
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        # Condensed in member order, so they are written in the same order
+        # however many processes condense them
+        condensed = condensed_xml_files(xml_files, jobs)
+        for arcname, f in members:
+            if f.name.endswith((".xml", ".rels")):
+                # Remove pretty-printing whitespace
+                zinfo = zipfile.ZipInfo.from_file(f, arcname)
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(zinfo, next(condensed), compresslevel=compresslevel)
+            elif f.suffix.lower() in STORED_EXTENSIONS:
+                zf.write(f, arcname, compress_type=zipfile.ZIP_STORED)
+            else:
+                zf.write(f, arcname, compresslevel=compresslevel)
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
@@ -131,28 +194,94 @@ def validate_document(doc_path):
 
 
 def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+    """Strip unnecessary whitespace and remove comments, rewriting the file."""
+    condensed = condensed_xml(xml_file)
+    with open(xml_file, "wb") as f:
+        f.write(condensed)
+
+
+def condensed_xml(xml_file):
+    """Return the XML of a file with unnecessary whitespace and comments removed."""
+    tree = parse_xml(xml_file)
 
     # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
+    comments = []
+    for element in tree.getroot().iter(lxml.etree.Element):
         # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
+        if element.tag.endswith("}t") and element.prefix:
             continue
 
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
+        # Remove whitespace-only text and comments; an element's text runs
+        # up to its first child, the tail of each child up to the next one
+        if element.text is not None and not element.text.strip():
+            element.text = None
+        for child in element:
+            if child.tail is not None and not child.tail.strip():
+                child.tail = None
+            if child.tag is lxml.etree.Comment:
+                comments.append(child)
+    for comment in comments:
+        remove_keeping_tail(comment)
 
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    return xml_declaration(tree, "UTF-8") + lxml.etree.tostring(
+        tree, encoding="UTF-8", xml_declaration=False
+    )
+
+
+def condensed_xml_files(xml_files, jobs=1):
+    """Yield the condensed_xml of each of xml_files, in order, using jobs processes."""
+    if jobs <= 1 or len(xml_files) < 2:
+        yield from map(condensed_xml, xml_files)
+        return
+
+    # Only needed for parallel runs, so kept off the cold-start path
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        chunksize = max(1, len(xml_files) // (jobs * 4))
+        yield from executor.map(condensed_xml, xml_files, chunksize=chunksize)
+
+
+def parse_xml(xml_file):
+    """Parse an XML file into an lxml tree with defusedxml's protections.
+
+    Entities are never expanded, nothing is loaded from a DTD or over the
+    network, and files declaring entities raise EntitiesForbidden, as with
+    defusedxml.minidom. Comments and processing instructions are kept.
+
+    Like expat, the parser accepts nesting deeper than 256 levels and text
+    nodes over 10 MB, which large worksheets and documents can have; with
+    entities refused, lifting libxml2's limits opens no expansion attack.
+    """
+    parser = lxml.etree.XMLParser(
+        resolve_entities=False, no_network=True, load_dtd=False, huge_tree=True
+    )
+    tree = lxml.etree.parse(str(xml_file), parser)
+    dtd = tree.docinfo.internalDTD
+    for entity in dtd.iterentities() if dtd is not None else ():
+        raise EntitiesForbidden(
+            entity.name, entity.content, None, entity.system_url, None, None
+        )
+    return tree
+
+
+def xml_declaration(tree, encoding):
+    """Return the XML declaration for writing tree in encoding, as bytes."""
+    # lxml cannot tell standalone="no" from no standalone declaration, which
+    # mean the same, so only "yes" is carried over
+    standalone = ' standalone="yes"' if tree.docinfo.standalone else ""
+    return f'<?xml version="1.0" encoding="{encoding}"{standalone}?>'.encode(encoding)
+
+
+def remove_keeping_tail(node):
+    """Remove node from its parent, leaving the text that follows it in place."""
+    parent, previous, tail = node.getparent(), node.getprevious(), node.tail
+    parent.remove(node)  # Takes the tail along
+    if tail:
+        if previous is not None:
+            previous.tail = (previous.tail or "") + tail
+        else:
+            parent.text = (parent.text or "") + tail
 
 
 if __name__ == "__main__":
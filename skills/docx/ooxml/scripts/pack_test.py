@@ -0,0 +1,150 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from defusedxml import EntitiesForbidden
+
+from pack import condensed_xml, pack_document
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
+FILES = {
+    "[Content_Types].xml": '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="urn:types">\n  <Default Extension="xml"/>\n</Types>\n',
+    "_rels/.rels": '<Relationships xmlns="urn:rels">\n  <Relationship/>\n'
+    "</Relationships>\n",
+    "word/document.xml": f'<w:document xmlns:w="{W_NS}">\n  <w:body>\n'
+    "    <w:p/>\n  </w:body>\n</w:document>\n",
+    "Bin/data.bin": "data " * 1000,
+    "word/media/image1.png": "not really a PNG " * 100,
+}
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPackDocument(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.input_dir = self.root / "unpacked"
+        for name, content in FILES.items():
+            (self.input_dir / name).parent.mkdir(parents=True, exist_ok=True)
+            (self.input_dir / name).write_text(content, encoding="utf-8")
+
+    def pack(self, name="packed.docx", **options):
+        output_file = self.root / name
+        self.assertTrue(pack_document(self.input_dir, output_file, **options))
+        return output_file
+
+    def test_content_types_come_first_and_the_rest_in_name_order(self):
+        with zipfile.ZipFile(self.pack()) as zf:
+            names = zf.namelist()
+        self.assertEqual(names[0], "[Content_Types].xml")
+        self.assertEqual(names[1:], sorted(set(FILES) - {"[Content_Types].xml"}))
+
+    def test_xml_is_condensed_without_touching_the_input_directory(self):
+        with zipfile.ZipFile(self.pack()) as zf:
+            document = zf.read("word/document.xml").decode("utf-8")
+            data = zf.read("Bin/data.bin").decode("utf-8")
+        self.assertEqual(
+            document,
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<w:document xmlns:w="{W_NS}"><w:body><w:p/></w:body></w:document>',
+        )
+        self.assertEqual(data, FILES["Bin/data.bin"])
+        for name, content in FILES.items():
+            self.assertEqual(
+                (self.input_dir / name).read_text(encoding="utf-8"), content
+            )
+
+    def test_media_is_stored_and_everything_else_deflated_at_the_level(self):
+        sizes = {}
+        for level in [0, 9]:
+            output_file = self.pack(f"level{level}.docx", compresslevel=level)
+            with zipfile.ZipFile(output_file) as zf:
+                infos = {info.filename: info for info in zf.infolist()}
+            self.assertEqual(
+                infos["word/media/image1.png"].compress_type, zipfile.ZIP_STORED
+            )
+            for name in set(FILES) - {"word/media/image1.png"}:
+                self.assertEqual(infos[name].compress_type, zipfile.ZIP_DEFLATED)
+            sizes[level] = infos["Bin/data.bin"].compress_size
+
+        # Level 0 deflates without compressing
+        self.assertGreaterEqual(sizes[0], len(FILES["Bin/data.bin"]))
+        self.assertLess(sizes[9], len(FILES["Bin/data.bin"]) // 10)
+
+    def test_parallel_packing_writes_the_same_file(self):
+        sequential = self.pack("jobs1.docx", jobs=1)
+        parallel = self.pack("jobs2.docx", jobs=2)
+        with zipfile.ZipFile(parallel) as zf:
+            self.assertEqual(zf.namelist()[0], "[Content_Types].xml")
+        self.assertEqual(parallel.read_bytes(), sequential.read_bytes())
+
+    def test_output_inside_the_input_directory_is_not_packed_into_itself(self):
+        output_file = self.input_dir / "packed.docx"
+        self.assertTrue(pack_document(self.input_dir, output_file))
+        self.assertTrue(pack_document(self.input_dir, output_file))
+        with zipfile.ZipFile(output_file) as zf:
+            self.assertNotIn("packed.docx", zf.namelist())
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestCondensedXML(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.xml_file = Path(self.temp_dir.name) / "part.xml"
+
+    def condense(self, xml):
+        self.xml_file.write_text(xml, encoding="utf-8")
+        return condensed_xml(self.xml_file).decode("utf-8")
+
+    def test_whitespace_and_comments_are_dropped_outside_text_elements(self):
+        condensed = self.condense(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<w:document xmlns:w="{W_NS}" xmlns:a="{A_NS}">\n'
+            "  <!-- before the body -->\n"
+            "  <w:body>\n"
+            "    <w:p>\n"
+            '      <w:r><w:t xml:space="preserve">  </w:t></w:r>\n'
+            "      <w:r><w:t> a <!-- kept --> b </w:t></w:r>\n"
+            "    </w:p>\n"
+            "    <a:t> \u00e9 </a:t><!-- gone -->tail\n"
+            "  </w:body>\n"
+            "</w:document>\n"
+        )
+        self.assertEqual(
+            condensed,
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{W_NS}" xmlns:a="{A_NS}"><w:body><w:p>'
+            '<w:r><w:t xml:space="preserve">  </w:t></w:r>'
+            "<w:r><w:t> a <!-- kept --> b </w:t></w:r>"
+            "</w:p><a:t> \u00e9 </a:t>tail\n  </w:body></w:document>",
+        )
+
+    def test_deep_nesting_and_long_text_are_accepted(self):
+        # Beyond libxml2's default limits of 256 levels and 10 MB text nodes
+        depth, text = 300, "x" * (11 * 2**20)
+        condensed = self.condense(
+            f'<w:document xmlns:w="{W_NS}">'
+            + "<w:sdt>\n" * depth
+            + f"<w:t>{text}</w:t>"
+            + "</w:sdt>\n" * depth
+            + "</w:document>"
+        )
+        self.assertIn("<w:sdt>" * depth + f"<w:t>{text}</w:t>", condensed)
+
+    def test_entity_declarations_are_rejected(self):
+        with self.assertRaises(EntitiesForbidden):
+            self.condense(
+                '<!DOCTYPE a [<!ENTITY e SYSTEM "file:///etc/passwd">]><a>&e;</a>'
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,29 +1,283 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [--include PATTERN]
+        [--exclude PATTERN] [--pretty PATTERN] [--jobs N]
+
+Or from Python, unpacking only what is needed:
+    from unpack import unpack
+
+    with unpack("report.docx", "unpacked", lazy=True) as document:
+        xml_file = document.member_path("word/document.xml")  # Unpacked now
+"""
+
+import argparse
 import random
-import sys
-import defusedxml.minidom
 import zipfile
-from pathlib import Path
-
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+from pathlib import Path, PurePosixPath
+
+import lxml.etree
+
+try:
+    from .pack import parse_xml, xml_declaration
+except ImportError:  # Run as a script, or imported with the scripts on sys.path
+    from pack import parse_xml, xml_declaration
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack an Office file and pretty-print its XML"
+    )
+    parser.add_argument("office_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="PATTERN",
+        help="Only unpack members matching this glob, like word/*.xml (repeatable)",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="PATTERN",
+        help="Do not unpack members matching this glob, like *.png (repeatable)",
+    )
+    parser.add_argument(
+        "--pretty",
+        action="append",
+        metavar="PATTERN",
+        help="Only pretty-print the XML parts matching this glob (repeatable; "
+        "default: every .xml and .rels part)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for pretty-printing XML (default: 1)",
+    )
+    args = parser.parse_args()
+
+    unpack(
+        args.office_file,
+        args.output_dir,
+        include=args.include,
+        exclude=args.exclude,
+        pretty=args.pretty,
+        jobs=args.jobs,
+    )
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack(
+    office_file,
+    output_dir,
+    include=None,
+    exclude=None,
+    pretty=None,
+    jobs=1,
+    lazy=False,
+):
+    """Unpack an Office file into a directory and pretty-print its XML parts.
+
+    Patterns are globs over member names. Patterns without a "/" match at any
+    depth, like Path.rglob; patterns with one are matched against the whole
+    name, like Path.glob.
+
+    Args:
+        office_file: Path to the .docx/.pptx/.xlsx file
+        output_dir: Directory to unpack into, created if missing
+        include: Patterns of the members to unpack (default: every member)
+        exclude: Patterns of members not to unpack, even if included
+        pretty: Patterns of the XML parts to pretty-print (default: every .xml
+            and .rels part); the others are unpacked as they are
+        jobs: Number of worker processes pretty-printing XML parts (default: 1)
+        lazy: If True, unpack nothing yet; each member is unpacked when first
+            asked for through the returned UnpackedDocument
+
+    Returns:
+        UnpackedDocument: The unpacked members; pack.py only packs what is in
+            output_dir, so call its extract() before packing a partial or lazy
+            unpack
+    """
+    document = UnpackedDocument(office_file, output_dir, include, exclude, pretty, jobs)
+    if not lazy:
+        document.extract(document.names)
+        document.close()  # Reopened if members are asked for later
+    return document
+
+
+class UnpackedDocument:
+    """The members of an Office file selected for unpacking into a directory.
+
+    Members are unpacked on demand: member_path(), read() and open() unpack
+    the member they are given if it is not in the directory yet, and
+    extract() unpacks whatever is left. Files already in the directory when
+    it is opened are taken as unpacked, so edits survive reopening it lazily.
+    """
+
+    def __init__(
+        self, office_file, output_dir, include=None, exclude=None, pretty=None, jobs=1
+    ):
+        self.office_file = Path(office_file)
+        self.path = Path(output_dir)
+        self.jobs = jobs
+        self._zip = None
+        self.names = {
+            info.filename
+            for info in self.zip.infolist()
+            if not info.is_dir()
+            and (include is None or _matches(info.filename, include))
+            and not (exclude and _matches(info.filename, exclude))
+        }
+        self._pretty = {
+            name
+            for name in self.names
+            if name.endswith((".xml", ".rels"))
+            and (pretty is None or _matches(name, pretty))
+        }
+        self._unpacked = {name for name in self.names if (self.path / name).is_file()}
+
+    @property
+    def zip(self):
+        """The Office file's ZipFile, opened on first use."""
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.office_file, "r")
+        return self._zip
+
+    def __contains__(self, name):
+        return str(name) in self.names
+
+    def member_path(self, name):
+        """Return the path of an unpacked member, unpacking it if needed."""
+        name = str(name)
+        if name not in self.names:
+            raise KeyError(f"{name} is not among the members to unpack")
+        if name not in self._unpacked:
+            self.extract([name])
+        return self.path / name
+
+    def read(self, name):
+        """Return the bytes of an unpacked member, as pretty-printed if it is."""
+        return self.member_path(name).read_bytes()
+
+    def open(self, name):
+        """Return a binary file object reading an unpacked member."""
+        return open(self.member_path(name), "rb")
+
+    def extract(self, names=None):
+        """Unpack the given members, or by default every one not unpacked yet.
+
+        The XML parts among them are pretty-printed. Members that are named
+        are unpacked again, overwriting their files.
+        """
+        if names is None:
+            pending = sorted(self.names - self._unpacked)
+        else:
+            pending = sorted({str(name) for name in names})
+            unknown = set(pending) - self.names
+            if unknown:
+                raise KeyError(f"{min(unknown)} is not among the members to unpack")
+        self.path.mkdir(parents=True, exist_ok=True)
+        for name in pending:
+            self.zip.extract(name, self.path)
+        pretty_print_files(
+            [self.path / name for name in pending if name in self._pretty], self.jobs
+        )
+        self._unpacked.update(pending)
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _matches(name, patterns):
+    """Return True if member name matches any of the glob patterns."""
+    return any(
+        PurePosixPath(name).match(pattern)
+        and ("/" not in pattern or name.count("/") == pattern.count("/"))
+        for pattern in patterns
+    )
+
+
+def pretty_print(xml_file):
+    """Pretty-print an XML file, rewriting it."""
+    pretty = pretty_xml(xml_file)
+    with open(xml_file, "wb") as f:
+        f.write(pretty)
+
+
+def pretty_print_files(xml_files, jobs=1):
+    """Pretty-print each of xml_files in place, using jobs processes."""
+    if jobs <= 1 or len(xml_files) < 2:
+        for xml_file in xml_files:
+            pretty_print(xml_file)
+        return
+
+    # Only needed for parallel runs, so kept off the cold-start path
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        chunksize = max(1, len(xml_files) // (jobs * 4))
+        # Each part is written by its worker; list() surfaces their errors
+        list(executor.map(pretty_print, xml_files, chunksize=chunksize))
+
+
+def pretty_xml(xml_file, indent="  "):
+    """Return the XML of a file indented the way minidom's toprettyxml does it.
+
+    Every child node of an element, text included, goes on a line of its own,
+    unless the element holds nothing but text. Non-ASCII characters are
+    written as character references.
+    """
+    tree = parse_xml(xml_file)
+    root = tree.getroot()
+    _indent(root, 0, indent)
+
+    # The nodes around the root element (comments, processing instructions)
+    # cannot carry the newlines that separate them, so they are written in turn
+    nodes = [*reversed(list(root.itersiblings(preceding=True))), root]
+    nodes.extend(root.itersiblings())
+    lines = [xml_declaration(tree, "ascii")]
+    if tree.docinfo.doctype:
+        lines.append(tree.docinfo.doctype.encode("ascii", "xmlcharrefreplace"))
+    for node in nodes:
+        lines.append(
+            lxml.etree.tostring(
+                node, encoding="ascii", xml_declaration=False, with_tail=False
+            )
+        )
+    return b"\n".join(lines) + b"\n"
+
+
+def _indent(element, level, indent):
+    """Indent the content of element, at depth level, and of its descendants."""
+    children = list(element)  # Elements, comments and processing instructions
+    if not children:
+        return  # Empty or text only, kept on one line
+
+    inner = indent * (level + 1)
+    # minidom writes each text node as indentation, the text and a newline
+    element.text = "\n" + (f"{inner}{element.text}\n" if element.text else "") + inner
+    for position, child in enumerate(children):
+        last = position == len(children) - 1
+        tail = f"{inner}{child.tail}\n" if child.tail else ""
+        child.tail = "\n" + tail + (indent * level if last else inner)
+        if isinstance(child.tag, str):
+            _indent(child, level + 1, indent)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from pack import condensed_xml
+from unpack import pretty_xml, unpack
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+MEMBERS = {
+    "[Content_Types].xml": '<Types xmlns="urn:types"><Default Extension="xml"/>'
+    "</Types>",
+    "_rels/.rels": '<Relationships xmlns="urn:rels"><Relationship/></Relationships>',
+    "word/document.xml": f'<w:document xmlns:w="{W_NS}"><w:body><w:p><w:r>'
+    "<w:t> Hello </w:t></w:r></w:p></w:body></w:document>",
+    "word/styles.xml": f'<w:styles xmlns:w="{W_NS}"><w:style/></w:styles>',
+    "word/media/image1.png": "not really a PNG",
+}
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestUnpack(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.office_file = self.root / "document.docx"
+        with zipfile.ZipFile(self.office_file, "w") as zf:
+            for name, content in MEMBERS.items():
+                zf.writestr(name, content)
+        self.output_dir = self.root / "unpacked"
+
+    def unpacked_files(self):
+        return {
+            f.relative_to(self.output_dir).as_posix()
+            for f in self.output_dir.rglob("*")
+            if f.is_file()
+        }
+
+    def test_everything_is_unpacked_and_pretty_printed_by_default(self):
+        document = unpack(self.office_file, self.output_dir)
+        self.assertEqual(self.unpacked_files(), set(MEMBERS))
+        self.assertEqual(document.names, set(MEMBERS))
+        self.assertEqual(
+            (self.output_dir / "word/document.xml").read_text().splitlines()[4:7],
+            ["      <w:r>", "        <w:t> Hello </w:t>", "      </w:r>"],
+        )
+
+    def test_parallel_unpacking_writes_the_same_files(self):
+        unpack(self.office_file, self.output_dir, jobs=1)
+        parallel_dir = self.root / "parallel"
+        unpack(self.office_file, parallel_dir, jobs=2)
+        for name in MEMBERS:
+            self.assertEqual(
+                (parallel_dir / name).read_bytes(),
+                (self.output_dir / name).read_bytes(),
+            )
+
+    def test_only_selected_members_are_unpacked_and_pretty_printed(self):
+        unpack(
+            self.office_file,
+            self.output_dir,
+            include=["word/*", "word/media/*"],
+            exclude=["*.png"],
+            pretty=["word/document.xml"],
+        )
+        self.assertEqual(
+            self.unpacked_files(), {"word/document.xml", "word/styles.xml"}
+        )
+        self.assertIn(
+            "\n  <w:body>", (self.output_dir / "word/document.xml").read_text()
+        )
+        self.assertEqual(
+            (self.output_dir / "word/styles.xml").read_text(),
+            MEMBERS["word/styles.xml"],
+        )
+
+    def test_lazy_unpack_extracts_members_on_first_access(self):
+        with unpack(self.office_file, self.output_dir, lazy=True) as document:
+            self.assertFalse(self.output_dir.exists())
+            xml_file = document.member_path("word/document.xml")
+            self.assertEqual(self.unpacked_files(), {"word/document.xml"})
+            self.assertIn("<w:t> Hello </w:t>", xml_file.read_text())
+            with self.assertRaises(KeyError):
+                document.member_path("word/missing.xml")
+            xml_file.write_text("edited")
+
+        # Reopened lazily, edits are kept and only the rest is unpacked
+        with unpack(self.office_file, self.output_dir, lazy=True) as document:
+            document.extract()
+        self.assertEqual(self.unpacked_files(), set(MEMBERS))
+        self.assertEqual((self.output_dir / "word/document.xml").read_text(), "edited")
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPrettyXML(unittest.TestCase):
+
+    XML = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NS}"><!--note--><w:body><w:p><w:r>'
+        '<w:t xml:space="preserve">  </w:t><w:t> \u00e9 </w:t></w:r>text</w:p>'
+        "</w:body></w:document>"
+    )
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.xml_file = Path(self.temp_dir.name) / "part.xml"
+        self.xml_file.write_text(self.XML, encoding="utf-8")
+
+    def test_every_node_goes_on_its_own_line_like_minidom(self):
+        self.assertEqual(
+            pretty_xml(self.xml_file).decode("ascii").splitlines(),
+            [
+                '<?xml version="1.0" encoding="ascii" standalone="yes"?>',
+                f'<w:document xmlns:w="{W_NS}">',
+                "  <!--note-->",
+                "  <w:body>",
+                "    <w:p>",
+                "      <w:r>",
+                '        <w:t xml:space="preserve">  </w:t>',
+                "        <w:t> &#233; </w:t>",
+                "      </w:r>",
+                "      text",
+                "    </w:p>",
+                "  </w:body>",
+                "</w:document>",
+            ],
+        )
+
+    def test_condensing_undoes_pretty_printing(self):
+        # Mixed content aside, which minidom indents as well
+        self.xml_file.write_text(self.XML.replace("text", ""), encoding="utf-8")
+        condensed = condensed_xml(self.xml_file)
+        self.assertIn(b'<w:t xml:space="preserve">  </w:t>', condensed)
+        self.assertNotIn(b"<!--note-->", condensed)
+
+        self.xml_file.write_bytes(pretty_xml(self.xml_file))
+        self.assertEqual(condensed_xml(self.xml_file), condensed)
+
+if __name__ == "__main__":
+    unittest.main()
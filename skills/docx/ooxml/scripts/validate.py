@@ -3,21 +3,95 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--jobs N] [--format json]
+    python validate.py <dir> --original <original_file> --author NAME [--author NAME]
+    python validate.py <dir> --original <original_file> --xsd-cache <cache.sqlite>
+    python validate.py <dir> --original <original_file> --profile [N] [--trace FILE]
+    python validate.py <file> --original <original_file>
+
+Given a .docx/.pptx/.xlsx file instead of an unpacked directory, its parts are
+validated straight from the zip without extracting them.
 """
 
 import argparse
+import contextlib
 import sys
+import zipfile
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+    ValidationManifest,
+    ValidationProfiler,
+    ValidationReport,
+    XLSXSchemaValidator,
+    XSDResultCache,
+    ZipPackage,
+)
+
+
+def get_validators(file_extension):
+    """Return the validator classes to run on a type of Office file, or None."""
+    match file_extension:
+        case ".docx":
+            return [DOCXSchemaValidator, RedliningValidator]
+        case ".pptx":
+            return [PPTXSchemaValidator]
+        case ".xlsx":
+            return [XLSXSchemaValidator]
+        case _:
+            return None
+
+
+def run_validators(
+    validators,
+    unpacked_dir,
+    original_file,
+    report,
+    verbose=False,
+    jobs=1,
+    manifest=None,
+    authors=None,
+    xsd_cache=None,
+    profiler=None,
+):
+    """Run validators on one document, sharing one read-only view of the original.
+
+    authors are the tracked-change authors to validate (default: Claude);
+    xsd_cache is an optional XSDResultCache shared by the schema validators,
+    profiler an optional ValidationProfiler timing every rule and part.
+    Returns True if all of them pass; findings are collected in report.
+    """
+    success = True
+    with ZipPackage(original_file) as original_package:
+        for V in validators:
+            options = {
+                "verbose": verbose,
+                "original_package": original_package,
+                "manifest": manifest,
+                "report": report,
+                "profiler": profiler,
+            }
+            if issubclass(V, BaseSchemaValidator):
+                options["jobs"] = jobs
+                options["xsd_cache"] = xsd_cache
+            if issubclass(V, RedliningValidator) and authors:
+                options["authors"] = authors
+            validator = V(unpacked_dir, original_file, **options)
+            if not validator.validate():
+                success = False
+    return success
 
 
 def main():
     parser = argparse.ArgumentParser(description="Validate Office document XML files")
     parser.add_argument(
         "unpacked_dir",
-        help="Path to unpacked Office document directory",
+        help="Path to unpacked Office document directory, "
+        "or to a .docx/.pptx/.xlsx file",
     )
     parser.add_argument(
         "--original",
@@ -30,36 +104,116 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for XSD validation (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only revalidate parts changed since the last --incremental run "
+        "(results are kept in a .<dir>.validation.json file beside the directory)",
+    )
+    parser.add_argument(
+        "--author",
+        action="append",
+        dest="authors",
+        help="Author whose tracked changes are validated; repeat for several "
+        "(default: Claude)",
+    )
+    parser.add_argument(
+        "--xsd-cache",
+        help="SQLite file caching XSD results across documents and runs, for "
+        "parts shared by many documents (created if missing)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=int,
+        const=10,
+        metavar="N",
+        help="Time every rule on every part and print the N slowest (default: 10)",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="With --profile, also write the timings as a Chrome trace "
+        "(open in chrome://tracing or ui.perfetto.dev)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format; json prints a report of all findings and per-rule "
+        "timings to stdout, and progress messages to stderr (default: text)",
+    )
     args = parser.parse_args()
 
     # Validate paths
     unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
     file_extension = original_file.suffix.lower()
-    assert unpacked_dir.is_dir(), f"Error: {unpacked_dir} is not a directory"
+    assert unpacked_dir.is_dir() or zipfile.is_zipfile(unpacked_dir), (
+        f"Error: {unpacked_dir} is not a directory or an Office file"
+    )
     assert original_file.is_file(), f"Error: {original_file} is not a file"
     assert file_extension in [".docx", ".pptx", ".xlsx"], (
         f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
     )
 
     # Run validations
-    match file_extension:
-        case ".docx":
-            validators = [DOCXSchemaValidator, RedliningValidator]
-        case ".pptx":
-            validators = [PPTXSchemaValidator]
-        case _:
-            print(f"Error: Validation not supported for file type {file_extension}")
-            sys.exit(1)
+    validators = get_validators(file_extension)
+    if validators is None:
+        print(f"Error: Validation not supported for file type {file_extension}")
+        sys.exit(1)
 
-    # Run validators
-    success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+    manifest = None
+    if args.incremental:
+        manifest = ValidationManifest(
+            unpacked_dir.parent / f".{unpacked_dir.resolve().name}.validation.json"
+        )
+
+    xsd_cache = XSDResultCache(args.xsd_cache) if args.xsd_cache else None
+    profiler = ValidationProfiler() if args.profile or args.trace else None
+
+    # In json mode stdout carries only the report
+    report = ValidationReport()
+    output = sys.stderr if args.format == "json" else sys.stdout
+
+    with contextlib.redirect_stdout(output):
+        success = run_validators(
+            validators,
+            unpacked_dir,
+            original_file,
+            report,
+            verbose=args.verbose,
+            jobs=args.jobs,
+            manifest=manifest,
+            authors=args.authors,
+            xsd_cache=xsd_cache,
+            profiler=profiler,
+        )
+
+    if manifest is not None:
+        manifest.save()
+    if xsd_cache is not None:
+        xsd_cache.close()
+        print(
+            f"XSD cache: {xsd_cache.hits} hits, {xsd_cache.misses} misses "
+            f"({xsd_cache.hit_rate:.0%} hit rate)",
+            file=output,
+        )
+    if profiler is not None:
+        print(profiler.format_slowest_parts(args.profile or 10), file=output)
+        if args.trace:
+            profiler.save_chrome_trace(args.trace)
 
-    if success:
+    if args.format == "json":
+        print(report.to_json(indent=2))
+    elif success:
         print("All validations PASSED!")
 
     sys.exit(0 if success else 1)
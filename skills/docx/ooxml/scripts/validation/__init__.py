@@ -1,15 +1,30 @@
 """
-Validation modules for Word document processing.
+Validation modules for Word, PowerPoint and Excel document processing.
 """
 
 from .base import BaseSchemaValidator
 from .docx import DOCXSchemaValidator
+from .manifest import ValidationManifest
+from .package import DirectoryPackage, ZipPackage, open_package
 from .pptx import PPTXSchemaValidator
+from .profiling import ValidationProfiler
 from .redlining import RedliningValidator
+from .report import Finding, ValidationReport
+from .xlsx import XLSXSchemaValidator
+from .xsd_cache import XSDResultCache
 
 __all__ = [
     "BaseSchemaValidator",
+    "DirectoryPackage",
     "DOCXSchemaValidator",
+    "Finding",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "ValidationManifest",
+    "ValidationProfiler",
+    "ValidationReport",
+    "XLSXSchemaValidator",
+    "XSDResultCache",
+    "ZipPackage",
+    "open_package",
 ]
@@ -2,11 +2,57 @@
 Base validator with common validation logic for document files.
 """
 
+import contextlib
+import copy
+import io
+import json
+import posixpath
 import re
-from pathlib import Path
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+from xml.parsers import expat
 
 import lxml.etree
 
+from .manifest import hash_bytes
+from .package import (
+    Relationship,
+    ZipPackage,
+    open_package,
+    rels_part,
+    resolve_target,
+)
+from .report import Finding, ValidationReport
+from .scan import PartRoot, scan_part
+from .schemas import SCHEMAS_DIR, load_schema, schema_id
+from .xsd_cache import XSDResultCache
+
+# Validator owned by an XSD worker process, created once by _init_xsd_worker so
+# its compiled schemas and original-file cache are reused for every part
+_worker_validator = None
+
+
+def _init_xsd_worker(validator_class, unpacked_dir, original_file, xsd_cache_path):
+    global _worker_validator
+    xsd_cache = None
+    if xsd_cache_path is not None:
+        xsd_cache = XSDResultCache(xsd_cache_path)
+        xsd_cache.close_at_exit()
+    _worker_validator = validator_class(
+        unpacked_dir, original_file, xsd_cache=xsd_cache
+    )
+
+
+def _validate_file_in_worker(xml_file):
+    """Validate a part, returning the result and the worker's cache hits/misses."""
+    xsd_cache = _worker_validator.xsd_cache
+    if xsd_cache is None:
+        return _worker_validator.validate_file_against_xsd(xml_file), 0, 0
+    hits, misses = xsd_cache.hits, xsd_cache.misses
+    result = _worker_validator.validate_file_against_xsd(xml_file)
+    return result, xsd_cache.hits - hits, xsd_cache.misses - misses
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -84,6 +130,16 @@ class BaseSchemaValidator:
     # Folders where we should clean ignorable namespaces
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
+    # Template tags, removed from text content before XSD validation
+    TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
+    # Rules that check the package as a whole (relationships, content types and
+    # the member list) rather than one part at a time. With a manifest they are
+    # skipped when they passed last time and none of those inputs has changed.
+    # validate_content_types also checks each part's root element, so it is
+    # not one of them; it narrows itself to changed parts instead.
+    PACKAGE_RULES = {"validate_file_references"}
+
     # All allowed OOXML namespaces (superset of all document types)
     OOXML_NAMESPACES = {
         "http://schemas.openxmlformats.org/officeDocument/2006/math",
@@ -103,45 +159,370 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        original_package=None,
+        jobs=1,
+        manifest=None,
+        report=None,
+        xsd_cache=None,
+        profiler=None,
+    ):
+        # unpacked_dir may also be a zipped .docx/.pptx, whose parts are then
+        # read straight from the archive; parts are still addressed by their
+        # path under it (e.g. document.docx/word/document.xml)
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        self.package = open_package(self.unpacked_dir)
+
+        # Structured results, shared when several validators check one document
+        self.report = report if report is not None else ValidationReport()
+        self._current_rule = None
+        # Optional ValidationProfiler timing each rule and the parts it checks
+        self.profiler = profiler
+
+        # Number of worker processes for per-part XSD validation (1 = in-process)
+        self.jobs = max(1, jobs)
+
+        # Original document, read lazily from the zip (may be shared between validators)
+        self._original_package = original_package
+        # XSD errors of each part in the original, keyed by relative POSIX path
+        self._original_xsd_errors = {}
+        # Optional XSDResultCache of results across documents and runs
+        self.xsd_cache = xsd_cache
+
+        # Parsed trees (or the XMLSyntaxError raised while parsing) of every part
+        # read so far, so each file is parsed once no matter how many checks run
+        self._parsed_parts = {}
+        self._parsed_original_parts = {}
+        # Root elements found by _scan_xml, for checks that need no whole tree
+        self._part_roots = {}
+        # Parse errors of parts that expat passed but lxml rejects (say, for
+        # nesting too deep), by part; None once _run_rule has reported them
+        self._late_parse_errors = {}
+        # Relationships of every .rels part read so far, keyed by member name;
+        # together with package.names this indexes the whole package graph
+        self._relationship_graph = {}
 
         # Set schemas directory
-        self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+        self.schemas_dir = SCHEMAS_DIR
 
-        # Get all XML and .rels files
-        patterns = ["*.xml", "*.rels"]
-        self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
-        ]
+        # Get all XML and .rels files, sorted so output order is stable across runs
+        self.xml_files = self._part_files("*.xml", "*.rels")
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
+            self._finding(
+                f"No XML files found in {self.unpacked_dir}", severity="warning"
+            )
+
+        # Incremental validation against the last run recorded in the manifest
+        self.manifest = manifest
+        self._manifest_section = None
+        if manifest is not None:
+            self._load_manifest_state()
+
+    @property
+    def original_package(self):
+        """Read-only view of the original file, opened on first use."""
+        if self._original_package is None:
+            self._original_package = ZipPackage(self.original_file)
+        return self._original_package
 
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def _member_name(self, path):
+        """Return the package member name (relative POSIX path) of a file."""
+        return Path(path).relative_to(self.unpacked_dir).as_posix()
+
+    def _part_files(self, *patterns):
+        """Return the sorted paths of all parts whose name matches any pattern.
+
+        Patterns without a "/" match at any depth, like Path.rglob; patterns
+        with one are matched against the whole name, like Path.glob.
+        """
+        return sorted(
+            self.unpacked_dir / name
+            for name in self.package.names
+            if any(
+                PurePosixPath(name).match(pattern)
+                and ("/" not in pattern or name.count("/") == pattern.count("/"))
+                for pattern in patterns
+            )
+        )
+
+    def _part_exists(self, path):
+        """Return True if path (inside unpacked_dir) is a part of the package."""
+        try:
+            return self._member_name(path) in self.package
+        except ValueError:
+            return False  # Outside the package
+
+    def _load_manifest_state(self):
+        """Compare the package with the manifest's last run to find changed parts."""
+        name = type(self).__name__
+        previous = self.manifest.previous(name, self.original_file)
+        previous_parts = previous.get("parts", {})
+
+        part_hashes = {
+            self._member_name(f): hash_bytes(self.package.read(self._member_name(f)))
+            for f in self.xml_files
+        }
+        changed = {
+            f
+            for f in self.xml_files
+            if previous_parts.get(self._member_name(f))
+            != part_hashes[self._member_name(f)]
+        }
+        # Relationship checks on a part also depend on its .rels file
+        for f in list(changed):
+            if f.suffix == ".rels" and f.parent.name == "_rels":
+                changed.add(f.parent.parent / f.stem)
+
+        # Package-wide rules depend on the member list, .rels files and content types
+        members = sorted(self.package.names)
+        package_hashes = [
+            part_hashes[m]
+            for m in sorted(part_hashes)
+            if m.endswith(".rels") or m == "[Content_Types].xml"
+        ]
+        package_key = hash_bytes(json.dumps([members, package_hashes]).encode())
+
+        self._changed_parts = changed
+        self._package_changed = previous.get("package") != package_key
+        self._previous_rules = previous.get("rules", {})
+        self._previous_global_id_parts = set(previous.get("global_id_parts", []))
+        # XSD results can only be reused for parts whose content is unchanged
+        self._previous_xsd = {
+            member: result
+            for member, result in previous.get("xsd", {}).items()
+            if member in part_hashes
+            and previous_parts.get(member) == part_hashes[member]
+        }
+
+        self._manifest_section = self.manifest.record(name, self.original_file)
+        self._manifest_section.update(
+            parts=part_hashes, package=package_key, rules={}, xsd={}
+        )
+
+    def _run_rule(self, rule):
+        """Run one validate_* check, recording its outcome and wall time.
+
+        Package-wide rules are skipped entirely when the manifest shows they
+        passed and their inputs are unchanged; per-part rules narrow themselves
+        to changed parts through _parts_to_check.
+        """
+        name = rule.__name__
+        self._current_rule = name
+        start = time.perf_counter()
+        with self._profile_span(name):
+            if (
+                self._manifest_section is not None
+                and name in self.PACKAGE_RULES
+                and self._previous_rules.get(name)
+                and not self._package_changed
+            ):
+                if self.verbose:
+                    print(f"PASSED - {name}: package unchanged since last validation")
+                passed = True
+            else:
+                passed = rule()
+        if not self._report_late_parse_errors():
+            passed = False
+
+        self._current_rule = None
+        self.report.record_rule(name, passed, time.perf_counter() - start)
+        if self._manifest_section is not None:
+            self._manifest_section["rules"][name] = passed
+        return passed
+
+    def _report_late_parse_errors(self):
+        """Report parse errors the rule ran into that validate_xml could not see.
+
+        Rules skip parts they cannot parse, taking them as reported by
+        validate_xml, which only uses expat. Returns False if there were any.
+        """
+        late = [(f, e) for f, e in self._late_parse_errors.items() if e is not None]
+        if not late:
+            return True
+        print(f"FAILED - Found {len(late)} XML violations:")
+        for xml_file, e in late:
+            print(self._finding(e.msg, xml_file, e.lineno))
+            self._late_parse_errors[xml_file] = None
+        return False
+
+    def _profile_span(self, rule, part=None):
+        """Return a context timing rule's work on part, if profiling."""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.span(rule, part)
+
+    def _profiled(self, xml_files):
+        """Iterate over xml_files, timing the rule's work on each if profiling."""
+        if self.profiler is None:
+            yield from xml_files
+            return
+        for xml_file in xml_files:
+            with self._profile_span(self._current_rule, self._member_name(xml_file)):
+                yield xml_file
+
+    def _profile_parse(self, package, member):
+        """Count a member of package as parsed, if profiling."""
+        if self.profiler is not None:
+            self.profiler.add_bytes(package.size(member))
+
+    def _finding(
+        self, message, xml_file=None, line=None, severity="error", detail=None
+    ):
+        """Add a finding of the rule being run to the report and return it.
+
+        xml_file may be a path inside unpacked_dir or a member name.
+        """
+        part = None
+        if xml_file is not None:
+            part = str(xml_file)
+            if Path(xml_file).is_absolute():
+                part = self._member_name(xml_file)
+        return self.report.add(
+            Finding(
+                rule=self._current_rule,
+                message=message,
+                part=part,
+                line=line,
+                severity=severity,
+                detail=detail,
+            )
+        )
+
+    def _parts_to_check(self, rule, xml_files=None):
+        """Return the parts a per-part rule has to look at.
+
+        That is every part, unless the manifest shows the rule passed on the
+        last run: unchanged parts are then known to pass and are left out.
+        """
+        xml_files = self.xml_files if xml_files is None else xml_files
+        if self._manifest_section is None or not self._previous_rules.get(rule):
+            return xml_files
+        return [f for f in xml_files if f in self._changed_parts]
+
+    def _parse_xml(self, xml_file):
+        """Return the parsed tree of a part, parsing it at most once.
+
+        The tree is shared by every check and must not be modified; use
+        _parse_xml_copy for checks that need to change it.
+        Raises lxml.etree.XMLSyntaxError if the part is not well-formed.
+        """
+        xml_file = Path(xml_file)
+        tree = self._parsed_parts.get(xml_file)
+        if tree is None:
+            self._profile_parse(self.package, self._member_name(xml_file))
+            try:
+                with self.package.open(self._member_name(xml_file)) as source:
+                    tree = lxml.etree.parse(source)
+            except lxml.etree.XMLSyntaxError as e:
+                tree = e
+            self._parsed_parts[xml_file] = tree
+        if isinstance(tree, lxml.etree.XMLSyntaxError):
+            part_root = self._part_roots.get(xml_file)
+            if part_root is not None and part_root.well_formed:
+                # validate_xml passed the part, so it never reported this
+                self._late_parse_errors.setdefault(xml_file, tree)
+            raise tree
+        return tree
+
+    def _scan_xml(self, xml_file, stop_after_root=False):
+        """Return the PartRoot of a part, without building its tree if possible.
+
+        Unless stop_after_root, the whole part is checked for well-formedness.
+        A part expat rejects or cannot read, such as one in a multi-byte
+        encoding, is parsed with lxml, which either raises
+        lxml.etree.XMLSyntaxError with its more precise message or provides
+        the root after all.
+        """
+        xml_file = Path(xml_file)
+        part_root = self._part_roots.get(xml_file)
+        if part_root is not None and (part_root.well_formed or stop_after_root):
+            return part_root
+        if xml_file in self._parsed_parts:
+            part_root = PartRoot.from_element(self._parse_xml(xml_file).getroot())
+        else:
+            self._profile_parse(self.package, self._member_name(xml_file))
+            try:
+                with self.package.open(self._member_name(xml_file)) as source:
+                    part_root = scan_part(source, stop_after_root)
+            except (expat.ExpatError, ValueError, LookupError):
+                part_root = PartRoot.from_element(self._parse_xml(xml_file).getroot())
+        self._part_roots[xml_file] = part_root
+        return part_root
+
+    def _relationships(self, rels_member):
+        """Return the Relationships of a .rels part, reading it at most once.
+
+        Raises lxml.etree.XMLSyntaxError if the part is not well-formed.
+        """
+        relationships = self._relationship_graph.get(rels_member)
+        if relationships is None:
+            root = self._parse_xml(self.unpacked_dir / rels_member).getroot()
+            relationships = []
+            tag = f"{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+            for rel in root.iter(tag):
+                target = rel.get("Target")
+                external = not target or (
+                    rel.get("TargetMode") == "External"
+                    or target.startswith(("http", "mailto:"))
+                )
+                relationships.append(
+                    Relationship(
+                        id=rel.get("Id"),
+                        type=rel.get("Type", ""),
+                        target=target,
+                        part=None if external else resolve_target(rels_member, target),
+                        line=rel.sourceline,
+                    )
+                )
+            self._relationship_graph[rels_member] = relationships
+        return relationships
+
+    def _parse_xml_copy(self, xml_file):
+        """Return a private copy of a part's parsed tree that may be modified."""
+        return copy.deepcopy(self._parse_xml(xml_file))
+
+    def _parse_original_xml(self, member):
+        """Return the parsed tree of a part of the original file, parsing it at most once.
+
+        Raises KeyError if the original has no such part.
+        """
+        tree = self._parsed_original_parts.get(member)
+        if tree is None:
+            self._profile_parse(self.original_package, member)
+            try:
+                source = io.BytesIO(self.original_package.read(member))
+                tree = lxml.etree.parse(source)
+            except lxml.etree.XMLSyntaxError as e:
+                tree = e
+            self._parsed_original_parts[member] = tree
+        if isinstance(tree, lxml.etree.XMLSyntaxError):
+            raise tree
+        return tree
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self._profiled(self._parts_to_check("validate_xml")):
             try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                # Scan the XML file; its tree is built later by the checks needing it
+                self._scan_xml(xml_file)
             except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
+                errors.append(self._finding(e.msg, xml_file, e.lineno))
             except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
-                )
+                errors.append(self._finding(f"Unexpected error: {str(e)}", xml_file))
 
         if errors:
             print(f"FAILED - Found {len(errors)} XML violations:")
@@ -157,19 +538,21 @@ class BaseSchemaValidator:
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self._profiled(self._parts_to_check("validate_namespaces")):
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+                # Only the root element matters, so the rest is not read
+                root = self._scan_xml(xml_file, stop_after_root=True)
+                declared = root.prefixes  # Excludes the default namespace
 
                 for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
+                    v for k, v in root.attributes.items() if k.endswith("Ignorable")
                 ]:
                     undeclared = set(attr_val.split()) - declared
                     errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
+                        self._finding(
+                            f"Namespace '{ns}' in Ignorable but not declared", xml_file
+                        )
+                        for ns in sorted(undeclared)
                     )
             except lxml.etree.XMLSyntaxError:
                 continue
@@ -187,18 +570,32 @@ class BaseSchemaValidator:
         """Validate that specific IDs are unique according to OOXML requirements."""
         errors = []
         global_ids = {}  # Track globally unique IDs across all files
-
-        for xml_file in self.xml_files:
+        global_id_parts = set()  # Parts holding any globally unique ID
+
+        xml_files = self._parts_to_check("validate_unique_ids")
+        if xml_files is not self.xml_files:
+            # Unchanged parts holding global IDs must still be compared against
+            checked = set(xml_files)
+            xml_files = [
+                f
+                for f in self.xml_files
+                if f in checked
+                or self._member_name(f) in self._previous_global_id_parts
+            ]
+
+        for xml_file in self._profiled(xml_files):
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
                 file_ids = {}  # Track IDs that must be unique within this file
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
+                # Remove all mc:AlternateContent elements from the tree, working on
+                # a private copy so the shared parsed tree stays intact
+                mc_xpath = ".//mc:AlternateContent"
+                mc_namespaces = {"mc": self.MC_NAMESPACE}
+                if root.xpath(mc_xpath, namespaces=mc_namespaces):
+                    root = self._parse_xml_copy(xml_file).getroot()
+                    for elem in root.xpath(mc_xpath, namespaces=mc_namespaces):
+                        elem.getparent().remove(elem)
 
                 # Now check IDs in the cleaned tree
                 for elem in root.iter():
@@ -227,15 +624,19 @@ class BaseSchemaValidator:
 
                         if id_value is not None:
                             if scope == "global":
+                                global_id_parts.add(self._member_name(xml_file))
                                 # Check global uniqueness
                                 if id_value in global_ids:
                                     prev_file, prev_line, prev_tag = global_ids[
                                         id_value
                                     ]
                                     errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                                        self._finding(
+                                            f"Global ID '{id_value}' in <{tag}> "
+                                            f"already used in {prev_file} at line {prev_line} in <{prev_tag}>",
+                                            xml_file,
+                                            elem.sourceline,
+                                        )
                                     )
                                 else:
                                     global_ids[id_value] = (
@@ -252,17 +653,21 @@ class BaseSchemaValidator:
                                 if id_value in file_ids[key]:
                                     prev_line = file_ids[key][id_value]
                                     errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
+                                        self._finding(
+                                            f"Duplicate {attr_name}='{id_value}' in <{tag}> "
+                                            f"(first occurrence at line {prev_line})",
+                                            xml_file,
+                                            elem.sourceline,
+                                        )
                                     )
                                 else:
                                     file_ids[key][id_value] = elem.sourceline
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._finding(f"Error: {e}", xml_file))
+
+        if self._manifest_section is not None:
+            self._manifest_section["global_id_parts"] = sorted(global_id_parts)
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -281,92 +686,53 @@ class BaseSchemaValidator:
         errors = []
 
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_files = self._part_files("*.rels")
 
         if not rels_files:
             if self.verbose:
                 print("PASSED - No .rels files found")
             return True
 
-        # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
+        # Every part except [Content_Types].xml and the .rels files themselves
+        # must be the target of some relationship
+        target_parts = {
+            name
+            for name in self.package.names
+            if posixpath.basename(name) != "[Content_Types].xml"
+            and not name.endswith(".rels")
+        }
 
-        # Track all files that are referenced by any .rels file
-        all_referenced_files = set()
+        # Track all parts that are referenced by any .rels file
+        referenced_parts = set()
 
         if self.verbose:
             print(
-                f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
+                f"Found {len(rels_files)} .rels files and {len(target_parts)} target files"
             )
 
-        # Check each .rels file
-        for rels_file in rels_files:
+        # Check each .rels file against the package's member list
+        for rels_file in self._profiled(rels_files):
             try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
-                broken_refs = []
+                relationships = self._relationships(self._member_name(rels_file))
+            except Exception as e:
+                errors.append(self._finding(f"Error parsing: {e}", rels_file))
+                continue
 
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
-                    if target and not target.startswith(
-                        ("http", "mailto:")
-                    ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
-                        else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
-
-                # Report broken references
-                if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
-                    for broken_ref, line_num in broken_refs:
-                        errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
+            for rel in relationships:
+                if rel.part is None:
+                    continue  # Skip external URLs
+                if rel.part in self.package:
+                    referenced_parts.add(rel.part)
+                else:
+                    errors.append(
+                        self._finding(
+                            f"Broken reference to {rel.target}", rels_file, rel.line
                         )
-
-            except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
+                    )
 
         # Check for unreferenced files (files that exist but are not referenced anywhere)
-        unreferenced_files = set(all_files) - all_referenced_files
-
-        if unreferenced_files:
-            for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+        for unreferenced in sorted(target_parts - referenced_parts):
+            errors.append(self._finding("Unreferenced file", unreferenced))
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship validation errors:")
@@ -390,58 +756,50 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
+        for xml_file in self._profiled(
+            self._parts_to_check("validate_all_relationship_ids")
+        ):
             # Skip .rels files themselves
             if xml_file.suffix == ".rels":
                 continue
 
             # Determine the corresponding .rels file
             # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
+            rels_file = rels_part(self._member_name(xml_file))
 
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            if rels_file not in self.package:
                 continue
 
             try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                # Get valid relationship IDs and their types from the .rels file
                 rid_to_type = {}
 
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
+                for rel in self._relationships(rels_file):
+                    if rel.id:
                         # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
+                        if rel.id in rid_to_type:
                             errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+                                self._finding(
+                                    f"Duplicate relationship ID '{rel.id}' (IDs must be unique)",
+                                    rels_file,
+                                    rel.line,
+                                )
                             )
                         # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
+                        rid_to_type[rel.id] = rel.type.split("/")[-1]
 
                 # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
+                xml_root = self._parse_xml(xml_file).getroot()
 
                 # Find all elements with r:id attributes
                 for elem in xml_root.iter():
                     # Check for r:id attribute (relationship ID)
                     rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
                     if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
                         elem_name = (
                             elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
                         )
@@ -449,9 +807,12 @@ class BaseSchemaValidator:
                         # Check if the ID exists
                         if rid_attr not in rid_to_type:
                             errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+                                self._finding(
+                                    f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                                    f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})",
+                                    xml_file,
+                                    elem.sourceline,
+                                )
                             )
                         # Check if we have type expectations for this element
                         elif self.ELEMENT_RELATIONSHIP_TYPES:
@@ -463,14 +824,16 @@ class BaseSchemaValidator:
                                 # Check if the actual type matches or contains the expected type
                                 if expected_type not in actual_type.lower():
                                     errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
+                                        self._finding(
+                                            f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                            f"but should point to a '{expected_type}' relationship",
+                                            xml_file,
+                                            elem.sourceline,
+                                        )
                                     )
 
             except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+                errors.append(self._finding(f"Error processing: {e}", xml_file))
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
@@ -525,13 +888,14 @@ class BaseSchemaValidator:
 
         # Find [Content_Types].xml file
         content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        if not self._part_exists(content_types_file):
             print("FAILED - [Content_Types].xml file not found")
+            self._finding("File not found", "[Content_Types].xml")
             return False
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._parse_xml(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -575,15 +939,14 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
-
-            # Check all XML files for Override declarations
-            for xml_file in self.xml_files:
-                path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
-                    "\\", "/"
-                )
+            # Check all XML files for Override declarations. With the
+            # declarations and the member list unchanged since a passing run,
+            # only changed parts can have a root element needing one now.
+            xml_files = self.xml_files
+            if self._manifest_section is not None and not self._package_changed:
+                xml_files = self._parts_to_check("validate_content_types")
+            for xml_file in self._profiled(xml_files):
+                path_str = self._member_name(xml_file)
 
                 # Skip non-content files
                 if any(
@@ -593,38 +956,44 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse_xml(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
                         errors.append(
-                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+                            self._finding(
+                                f"File with <{root_name}> root not declared in [Content_Types].xml",
+                                path_str,
+                            )
                         )
 
                 except Exception:
                     continue  # Skip unparseable files
 
             # Check all non-XML files for Default extension declarations
-            for file_path in all_files:
-                # Skip XML files and metadata files (already checked above)
-                if file_path.suffix.lower() in {".xml", ".rels"}:
-                    continue
-                if file_path.name == "[Content_Types].xml":
-                    continue
-                if "_rels" in file_path.parts or "docProps" in file_path.parts:
+            for name in sorted(self.package.names):
+                folders = name.split("/")[:-1]
+                # Skip metadata files
+                if "_rels" in folders or "docProps" in folders:
                     continue
 
-                extension = file_path.suffix.lstrip(".").lower()
+                extension = posixpath.splitext(name)[1].lstrip(".").lower()
+                # XML files were already checked above
+                if extension in {"xml", "rels"}:
+                    continue
                 if extension and extension not in declared_extensions:
                     # Check if it's a known media extension that should be declared
                     if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
                         errors.append(
-                            f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
+                            self._finding(
+                                f"File with extension '{extension}' not declared in [Content_Types].xml - should add: "
+                                f'<Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>',
+                                name,
+                            )
                         )
 
         except Exception as e:
-            errors.append(f"  Error parsing [Content_Types].xml: {e}")
+            errors.append(self._finding(f"Error parsing: {e}", "[Content_Types].xml"))
 
         if errors:
             print(f"FAILED - Found {len(errors)} content type declaration errors:")
@@ -673,7 +1042,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -692,11 +1061,10 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        for xml_file, (is_valid, new_file_errors) in zip(
+            self.xml_files, self._validate_files_against_xsd(self.xml_files)
+        ):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -711,8 +1079,10 @@ class BaseSchemaValidator:
                 continue
 
             # Has new errors
+            for error in sorted(new_file_errors):
+                self._finding(error, relative_path)
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -738,6 +1108,75 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self, xml_files):
+        """Run validate_file_against_xsd over xml_files, in parallel if jobs > 1.
+
+        Results are returned in the order of xml_files so output stays
+        deterministic regardless of which worker finishes first.
+        """
+        results = {}
+
+        # Reuse the results of parts unchanged since the last recorded run
+        pending = []
+        for xml_file in xml_files:
+            member = self._member_name(xml_file)
+            if self._manifest_section is not None and member in self._previous_xsd:
+                is_valid, errors = self._previous_xsd[member]
+                results[xml_file] = (is_valid, set(errors))
+            elif self._get_schema_path(xml_file) and self._matches_original(member):
+                # Any errors of a part identical to the original are pre-existing,
+                # so its schema need not even be compiled
+                results[xml_file] = (True, set())
+            else:
+                pending.append(xml_file)
+
+        if self.jobs == 1 or len(pending) < 2:
+            for xml_file in self._profiled(pending):
+                results[xml_file] = self.validate_file_against_xsd(xml_file)
+        else:
+            # Only needed for parallel runs, so kept off the cold-start path
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=_init_xsd_worker,
+                initargs=(
+                    type(self),
+                    self.unpacked_dir,
+                    self.original_file,
+                    self.xsd_cache.path if self.xsd_cache is not None else None,
+                ),
+            ) as executor:
+                chunksize = max(1, len(pending) // (self.jobs * 4))
+                outcomes = executor.map(
+                    _validate_file_in_worker, pending, chunksize=chunksize
+                )
+                for xml_file, (result, hits, misses) in zip(pending, outcomes):
+                    results[xml_file] = result
+                    # Lookups happen in the workers' own caches; count them here
+                    # so the hit rate reported for this run covers them
+                    if self.xsd_cache is not None:
+                        self.xsd_cache.hits += hits
+                        self.xsd_cache.misses += misses
+
+        if self._manifest_section is not None:
+            for xml_file, (is_valid, errors) in results.items():
+                member = self._member_name(xml_file)
+                self._manifest_section["xsd"][member] = [is_valid, sorted(errors)]
+
+        return [results[xml_file] for xml_file in xml_files]
+
+    def _matches_original(self, member):
+        """Return True if a part has exactly the same bytes in the original."""
+        try:
+            return (
+                member in self.original_package
+                and self.package.size(member) == self.original_package.size(member)
+                and self.package.read(member) == self.original_package.read(member)
+            )
+        except (OSError, zipfile.BadZipFile):
+            return False
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -762,65 +1201,65 @@ class BaseSchemaValidator:
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
+    def _preprocess_for_xsd(self, xml_doc, relative_path, copy_tree=True):
+        """Return a parsed part prepared for XSD validation, in one pass over one copy.
 
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
+        Template tags ({{ ... }}), placeholders for content replacement, are
+        removed from all text outside t elements and mc:Ignorable from the
+        root. In the main content folders, attributes and elements from
+        namespaces outside OOXML_NAMESPACES are removed as well.
 
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
+        The shared parsed tree is copied first; pass copy_tree=False for a
+        tree the caller owns, which is then modified in place.
+        """
+        if copy_tree:
+            xml_doc = copy.deepcopy(xml_doc)
+        root = xml_doc.getroot()
+        clean = (
+            bool(relative_path.parts)
+            and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+        )
 
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
+        # Whether a tag or attribute name is outside the allowed namespaces,
+        # worked out once per name as the same few names repeat throughout
+        foreign_names = {}
 
-        return lxml.etree.ElementTree(xml_copy)
+        def is_foreign(name):
+            foreign = foreign_names.get(name)
+            if foreign is None:
+                foreign = foreign_names[name] = clean and (
+                    name.startswith("{")
+                    and name[1:].partition("}")[0] not in self.OOXML_NAMESPACES
+                )
+            return foreign
 
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
         elements_to_remove = []
-
-        # Find elements to remove
-        for elem in list(root):
-            # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
+        for elem in root.iter():
+            tag = elem.tag
+            if not isinstance(tag, str):
+                continue  # Comments, processing instructions and entities
+            if elem is not root and is_foreign(tag):
+                elements_to_remove.append(elem)
                 continue
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
+            # Template tags are kept in the text of t elements
+            if not (tag.endswith("}t") or tag == "t"):
+                if elem.text and "{{" in elem.text:
+                    elem.text = self.TEMPLATE_TAG_PATTERN.sub("", elem.text)
+                if elem.tail and "{{" in elem.tail:
+                    elem.tail = self.TEMPLATE_TAG_PATTERN.sub("", elem.tail)
 
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
+            if clean:
+                for attr in elem.keys():
+                    if is_foreign(attr):
+                        del elem.attrib[attr]
 
-        # Remove collected elements
+        # Removed after the traversal, which must not see the tree change;
+        # an element's tail goes with it
         for elem in elements_to_remove:
-            root.remove(elem)
-
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
-
-        # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
+            elem.getparent().remove(elem)
 
+        root.attrib.pop(f"{{{self.MC_NAMESPACE}}}Ignorable", None)
         return xml_doc
 
     def _validate_single_file_xsd(self, xml_file, base_path):
@@ -830,121 +1269,86 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            # Load XML (the parsed tree is shared, preprocessing works on a copy)
+            xml_doc = self._parse_xml(xml_file)
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+            return self._validate_xml_doc_xsd(
+                xml_doc, xml_file.relative_to(base_path), schema_path
+            )
 
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+        except Exception as e:
+            return False, {str(e)}
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+    def _validate_xml_doc_xsd(
+        self, xml_doc, relative_path, schema_path, copy_tree=True
+    ):
+        """Preprocess a parsed part and validate it. Returns (is_valid, errors_set).
 
-            # Validate
-            if schema.validate(xml_doc):
-                return True, set()
-            else:
-                errors = set()
-                for error in schema.error_log:
-                    # Store normalized error message (without line numbers for comparison)
-                    errors.add(error.message)
-                return False, errors
+        copy_tree=False lets preprocessing modify a tree owned by the caller.
+        """
+        xml_doc = self._preprocess_for_xsd(xml_doc, relative_path, copy_tree)
+
+        # A part seen before, in any document, need not be validated again
+        cache_key = None
+        if self.xsd_cache is not None:
+            cache_key = (
+                schema_id(schema_path),
+                hash_bytes(lxml.etree.tostring(xml_doc)),
+            )
+            cached = self.xsd_cache.get(*cache_key)
+            if cached is not None:
+                return cached
 
-        except Exception as e:
-            return False, {str(e)}
+        # Load schema (compiled once per process)
+        schema = load_schema(schema_path)
+
+        # Validate
+        if schema.validate(xml_doc):
+            result = True, set()
+        else:
+            errors = set()
+            for error in schema.error_log:
+                # Store normalized error message (without line numbers for comparison)
+                errors.add(error.message)
+            result = False, errors
+
+        if cache_key is not None:
+            self.xsd_cache.put(*cache_key, *result)
+        return result
 
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        The part is read straight from the original zip, and the result is
+        cached so each original part is validated at most once per session.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
+        member = relative_path.as_posix()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
-
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
-
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
-
-        Template tags follow the pattern {{ ... }} and are used as placeholders
-        for content replacement. They should be removed from text content before
-        XSD validation while preserving XML structure.
-
-        Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
-        """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
+        if member not in self._original_xsd_errors:
+            errors = set()
+            # A file that didn't exist in the original has no original errors
+            schema_path = self._get_schema_path(xml_file)
+            if schema_path and member in self.original_package:
+                try:
+                    xml_doc = self._parse_original_xml(member)
+                    _, errors = self._validate_xml_doc_xsd(
+                        xml_doc, relative_path, schema_path
                     )
-                return template_pattern.sub("", text)
-            return text
-
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
-
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
+                except Exception as e:
+                    errors = {str(e)}
+            self._original_xsd_errors[member] = errors
 
-        return lxml.etree.ElementTree(xml_copy), warnings
+        return self._original_xsd_errors[member]
 
 
 if __name__ == "__main__":
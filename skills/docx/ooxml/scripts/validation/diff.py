@@ -0,0 +1,105 @@
+"""
+Paragraph-aligned character diff of document text, in git's --word-diff=plain format.
+"""
+
+import difflib
+
+# Minimum similarity ratio for a replaced paragraph to be diffed against a new one
+SIMILARITY = 0.5
+# Above this many candidate pairs, replaced paragraphs are paired by position
+MAX_ALIGNED_PAIRS = 10000
+
+
+def diff_paragraphs(original_paragraphs, modified_paragraphs):
+    """Return one line per changed paragraph, marking changes as [-old-]{+new+}.
+
+    Paragraphs are first aligned as whole strings, which compares them by
+    hash, so only paragraphs that actually differ are diffed character by
+    character. Unchanged paragraphs are left out, like git diff -U0.
+    """
+    lines = []
+    matcher = difflib.SequenceMatcher(
+        None, original_paragraphs, modified_paragraphs, autojunk=False
+    )
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        lines.extend(
+            _diff_block(original_paragraphs[i1:i2], modified_paragraphs[j1:j2])
+        )
+    return lines
+
+
+def _similarity(original, modified):
+    """Return how alike two paragraphs are (0 to 1), or 0 if below SIMILARITY."""
+    matcher = difflib.SequenceMatcher(None, original, modified, autojunk=False)
+    for ratio in (matcher.real_quick_ratio, matcher.quick_ratio, matcher.ratio):
+        if ratio() < SIMILARITY:
+            return 0
+    return matcher.ratio()
+
+
+def _diff_block(old, new):
+    """Diff a run of replaced paragraphs, pairing up the ones that are similar.
+
+    Pairs are chosen in order to maximise total similarity; paragraphs left
+    unpaired are shown as removed or added. Very large blocks are paired by
+    position instead.
+    """
+    if len(old) * len(new) > MAX_ALIGNED_PAIRS:
+        pairs = list(zip(range(len(old)), range(len(new))))
+    else:
+        # best[i][j]: highest total similarity aligning old[i:] with new[j:]
+        similarity = [[_similarity(a, b) for b in new] for a in old]
+        best = [[0.0] * (len(new) + 1) for _ in range(len(old) + 1)]
+        for i in reversed(range(len(old))):
+            for j in reversed(range(len(new))):
+                best[i][j] = max(best[i + 1][j], best[i][j + 1])
+                if similarity[i][j]:
+                    best[i][j] = max(best[i][j], similarity[i][j] + best[i + 1][j + 1])
+        pairs = []
+        i = j = 0
+        while i < len(old) and j < len(new):
+            if similarity[i][j] and best[i][j] == similarity[i][j] + best[i + 1][j + 1]:
+                pairs.append((i, j))
+                i, j = i + 1, j + 1
+            elif best[i][j] == best[i + 1][j]:
+                i += 1
+            else:
+                j += 1
+
+    lines = []
+    i = j = 0
+    for pair_i, pair_j in pairs + [(len(old), len(new))]:
+        lines.extend(f"[-{paragraph}-]" for paragraph in old[i:pair_i])
+        lines.extend(f"{{+{paragraph}+}}" for paragraph in new[j:pair_j])
+        if pair_i < len(old):
+            lines.append(diff_characters(old[pair_i], new[pair_j]))
+        i, j = pair_i + 1, pair_j + 1
+    return lines
+
+
+def diff_characters(original, modified):
+    """Return modified with the characters changed from original marked up."""
+    parts = []
+    matcher = difflib.SequenceMatcher(None, original, modified, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            parts.append(original[i1:i2])
+            continue
+        if i2 > i1:
+            parts.append(f"[-{original[i1:i2]}-]")
+        if j2 > j1:
+            parts.append(f"{{+{modified[j1:j2]}+}}")
+    return "".join(parts)
+
+
+def word_diff(original_text, modified_text):
+    """Diff two texts with one paragraph per line, returning the changed lines."""
+    return "\n".join(
+        diff_paragraphs(original_text.split("\n"), modified_text.split("\n"))
+    )
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -3,8 +3,6 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
-import zipfile
 
 import lxml.etree
 
@@ -24,44 +22,44 @@ class DOCXSchemaValidator(BaseSchemaValidator):
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
-        if not self.validate_xml():
+        if not self._run_rule(self.validate_xml):
             return False
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self._run_rule(self.validate_namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self._run_rule(self.validate_unique_ids):
             all_valid = False
 
         # Test 3: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not self._run_rule(self.validate_file_references):
             all_valid = False
 
         # Test 4: Content type declarations
-        if not self.validate_content_types():
+        if not self._run_rule(self.validate_content_types):
             all_valid = False
 
         # Test 5: XSD schema validation
-        if not self.validate_against_xsd():
+        if not self._run_rule(self.validate_against_xsd):
             all_valid = False
 
         # Test 6: Whitespace preservation
-        if not self.validate_whitespace_preservation():
+        if not self._run_rule(self.validate_whitespace_preservation):
             all_valid = False
 
         # Test 7: Deletion validation
-        if not self.validate_deletions():
+        if not self._run_rule(self.validate_deletions):
             all_valid = False
 
         # Test 8: Insertion validation
-        if not self.validate_insertions():
+        if not self._run_rule(self.validate_insertions):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self._run_rule(self.validate_all_relationship_ids):
             all_valid = False
 
         # Count and compare paragraphs
@@ -75,13 +73,15 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self._profiled(
+            self._parts_to_check("validate_whitespace_preservation")
+        ):
             # Only check document.xml files
             if xml_file.name != "document.xml":
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
 
                 # Find all w:t elements
                 for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
@@ -102,14 +102,15 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                                     else repr(text)
                                 )
                                 errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
+                                    self._finding(
+                                        f"w:t element with whitespace missing xml:space='preserve': {text_preview}",
+                                        xml_file,
+                                        elem.sourceline,
+                                    )
                                 )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._finding(f"Error: {e}", xml_file))
 
         if errors:
             print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
@@ -128,13 +129,13 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self._profiled(self._parts_to_check("validate_deletions")):
             # Only check document.xml files
             if xml_file.name != "document.xml":
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
 
                 # Find all w:t elements that are descendants of w:del elements
                 namespaces = {"w": self.WORD_2006_NAMESPACE}
@@ -151,14 +152,15 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                             else repr(t_elem.text)
                         )
                         errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
+                            self._finding(
+                                f"<w:t> found within <w:del>: {text_preview}",
+                                xml_file,
+                                t_elem.sourceline,
+                            )
                         )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._finding(f"Error: {e}", xml_file))
 
         if errors:
             print(f"FAILED - Found {len(errors)} deletion validation violations:")
@@ -180,7 +182,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
                 # Count all w:p elements
                 paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
                 count = len(paragraphs)
@@ -194,19 +196,12 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
+            # Parse document.xml straight from the original docx
+            root = self._parse_original_xml("word/document.xml").getroot()
 
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
-
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -220,12 +215,12 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self._profiled(self._parts_to_check("validate_insertions")):
             if xml_file.name != "document.xml":
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
                 namespaces = {"w": self.WORD_2006_NAMESPACE}
 
                 # Find w:delText in w:ins that are NOT within w:del
@@ -241,14 +236,15 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                         else repr(elem.text or "")
                     )
                     errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
+                        self._finding(
+                            f"<w:delText> within <w:ins>: {text_preview}",
+                            xml_file,
+                            elem.sourceline,
+                        )
                     )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._finding(f"Error: {e}", xml_file))
 
         if errors:
             print(f"FAILED - Found {len(errors)} insertion validation violations:")
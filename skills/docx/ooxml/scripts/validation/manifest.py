@@ -0,0 +1,66 @@
+"""
+Content-hash manifest of previous validation runs, for incremental validation.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+def hash_bytes(data):
+    """Return the SHA-256 hex digest of a part's contents."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ValidationManifest:
+    """Results of the last validation run, keyed by the content hash of each part.
+
+    Each validator keeps its own section, tied to the original file it was
+    compared against; a different original discards the section. Validators
+    only update the manifest in memory, call save() once they have all run.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.sections = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == self.VERSION:
+                self.sections = data.get("sections", {})
+        except (OSError, ValueError):
+            pass  # No usable previous run, validate everything
+
+    @staticmethod
+    def fingerprint(original_file):
+        """Identify an original file by path, size and modification time."""
+        stat = Path(original_file).stat()
+        return [str(Path(original_file).resolve()), stat.st_size, stat.st_mtime_ns]
+
+    def previous(self, name, original_file):
+        """Return the section recorded by validator `name`, or {} if it is stale."""
+        section = self.sections.get(name, {})
+        if section.get("original") != self.fingerprint(original_file):
+            return {}
+        return section
+
+    def record(self, name, original_file):
+        """Start a new section for validator `name` and return it for filling in."""
+        section = {"original": self.fingerprint(original_file)}
+        self.sections[name] = section
+        return section
+
+    def save(self):
+        """Write the manifest, replacing the previous one atomically."""
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(
+            json.dumps({"version": self.VERSION, "sections": self.sections}),
+            encoding="utf-8",
+        )
+        os.replace(temp_path, self.path)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,156 @@
+"""
+Read-only views of Office packages for validation.
+"""
+
+import os
+import posixpath
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+
+
+def open_package(path):
+    """Return a read-only view of an unpacked directory or a zipped Office file."""
+    if Path(path).is_dir():
+        return DirectoryPackage(path)
+    return ZipPackage(path)
+
+
+@dataclass(frozen=True)
+class Relationship:
+    """One <Relationship> of a .rels part."""
+
+    id: str | None
+    type: str
+    target: str | None
+    part: str | None  # Member name the target resolves to; None if external
+    line: int | None
+
+
+def rels_part(member):
+    """Return the name of the .rels part holding the relationships of member.
+
+    The package itself is the source of the root relationships, so
+    rels_part("") is "_rels/.rels".
+    """
+    directory, name = posixpath.split(member)
+    return posixpath.join(directory, "_rels", f"{name}.rels")
+
+
+def resolve_target(rels_member, target):
+    """Return the member name that a relationship target in rels_member points to.
+
+    Targets are relative to the source part's folder, e.g. word/ for
+    word/_rels/document.xml.rels, or absolute from the package root if they
+    start with "/". Targets outside the package resolve to a name starting
+    with "../", which is never a member.
+    """
+    if target.startswith("/"):
+        return posixpath.normpath(target.lstrip("/"))
+    source_dir = posixpath.dirname(posixpath.dirname(rels_member))
+    return posixpath.normpath(posixpath.join(source_dir, target))
+
+
+class DirectoryPackage:
+    """Read-only view of an unpacked Office document, with the ZipPackage interface."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._names = None
+
+    @property
+    def names(self):
+        """Set of member paths (POSIX style, relative to the package root)."""
+        if self._names is None:
+            # One os.walk lists every member without a stat call per file
+            self._names = set()
+            for directory, _, files in os.walk(self.path):
+                prefix = Path(directory).relative_to(self.path).as_posix()
+                self._names.update(
+                    name if prefix == "." else f"{prefix}/{name}" for name in files
+                )
+        return self._names
+
+    def __contains__(self, name):
+        return str(name) in self.names
+
+    def read(self, name):
+        """Return the raw bytes of a member."""
+        return (self.path / name).read_bytes()
+
+    def open(self, name):
+        """Return a binary file object reading a member."""
+        return open(self.path / name, "rb")
+
+    def size(self, name):
+        """Return the uncompressed size of a member in bytes."""
+        return (self.path / name).stat().st_size
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ZipPackage:
+    """Read-only view of an Office file's members, read directly from the zip.
+
+    The archive is opened lazily on first access and members are read into
+    memory on demand, so nothing is ever extracted to disk. A single instance
+    can be shared by every validator that needs to look at the same original.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._zip = None
+        self._names = None
+
+    @property
+    def zip(self):
+        """The underlying ZipFile, opened on first use."""
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.path, "r")
+        return self._zip
+
+    @property
+    def names(self):
+        """Set of member paths (POSIX style, relative to the package root)."""
+        if self._names is None:
+            self._names = {
+                info.filename for info in self.zip.infolist() if not info.is_dir()
+            }
+        return self._names
+
+    def __contains__(self, name):
+        return str(name) in self.names
+
+    def read(self, name):
+        """Return the raw bytes of a member."""
+        return self.zip.read(str(name))
+
+    def open(self, name):
+        """Return a binary file object streaming a member from the archive."""
+        return self.zip.open(str(name))
+
+    def size(self, name):
+        """Return the uncompressed size of a member in bytes."""
+        return self.zip.getinfo(str(name)).file_size
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -4,7 +4,10 @@ Validator for PowerPoint presentation XML files against XSD schemas.
 
 import re
 
+import lxml.etree
+
 from .base import BaseSchemaValidator
+from .package import rels_part
 
 
 class PPTXSchemaValidator(BaseSchemaValidator):
@@ -25,68 +28,72 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         "tablestyleid": "tablestyles",
     }
 
+    # Slide relationship checks only depend on .rels files
+    PACKAGE_RULES = BaseSchemaValidator.PACKAGE_RULES | {
+        "validate_notes_slide_references",
+        "validate_no_duplicate_slide_layouts",
+    }
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
-        if not self.validate_xml():
+        if not self._run_rule(self.validate_xml):
             return False
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self._run_rule(self.validate_namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self._run_rule(self.validate_unique_ids):
             all_valid = False
 
         # Test 3: UUID ID validation
-        if not self.validate_uuid_ids():
+        if not self._run_rule(self.validate_uuid_ids):
             all_valid = False
 
         # Test 4: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not self._run_rule(self.validate_file_references):
             all_valid = False
 
         # Test 5: Slide layout ID validation
-        if not self.validate_slide_layout_ids():
+        if not self._run_rule(self.validate_slide_layout_ids):
             all_valid = False
 
         # Test 6: Content type declarations
-        if not self.validate_content_types():
+        if not self._run_rule(self.validate_content_types):
             all_valid = False
 
         # Test 7: XSD schema validation
-        if not self.validate_against_xsd():
+        if not self._run_rule(self.validate_against_xsd):
             all_valid = False
 
         # Test 8: Notes slide reference validation
-        if not self.validate_notes_slide_references():
+        if not self._run_rule(self.validate_notes_slide_references):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self._run_rule(self.validate_all_relationship_ids):
             all_valid = False
 
         # Test 10: Duplicate slide layout references validation
-        if not self.validate_no_duplicate_slide_layouts():
+        if not self._run_rule(self.validate_no_duplicate_slide_layouts):
             all_valid = False
 
         return all_valid
 
     def validate_uuid_ids(self):
         """Validate that ID attributes that look like UUIDs contain only hex values."""
-        import lxml.etree
-
         errors = []
         # UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
         uuid_pattern = re.compile(
             r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
         )
 
-        for xml_file in self.xml_files:
+        for xml_file in self._profiled(self._parts_to_check("validate_uuid_ids")):
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
 
                 # Check all elements for ID attributes
                 for elem in root.iter():
@@ -99,14 +106,15 @@ class PPTXSchemaValidator(BaseSchemaValidator):
                                 # Validate that it contains only hex characters in the right positions
                                 if not uuid_pattern.match(value):
                                     errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: ID '{value}' appears to be a UUID but contains invalid hex characters"
+                                        self._finding(
+                                            f"ID '{value}' appears to be a UUID but contains invalid hex characters",
+                                            xml_file,
+                                            elem.sourceline,
+                                        )
                                     )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._finding(f"Error: {e}", xml_file))
 
         if errors:
             print(f"FAILED - Found {len(errors)} UUID ID validation errors:")
@@ -127,44 +135,41 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate_slide_layout_ids(self):
         """Validate that sldLayoutId elements in slide masters reference valid slide layouts."""
-        import lxml.etree
-
         errors = []
 
         # Find all slide master files
-        slide_masters = list(self.unpacked_dir.glob("ppt/slideMasters/*.xml"))
+        slide_masters = self._part_files("ppt/slideMasters/*.xml")
 
         if not slide_masters:
             if self.verbose:
                 print("PASSED - No slide masters found")
             return True
 
-        for slide_master in slide_masters:
+        for slide_master in self._profiled(
+            self._parts_to_check("validate_slide_layout_ids", slide_masters)
+        ):
             try:
                 # Parse the slide master file
-                root = lxml.etree.parse(str(slide_master)).getroot()
+                root = self._parse_xml(slide_master).getroot()
 
                 # Find the corresponding _rels file for this slide master
-                rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
+                rels_file = rels_part(self._member_name(slide_master))
 
-                if not rels_file.exists():
+                if rels_file not in self.package:
                     errors.append(
-                        f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                        f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}"
+                        self._finding(
+                            f"Missing relationships file: {rels_file}",
+                            slide_master,
+                        )
                     )
                     continue
 
-                # Parse the relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Build a set of valid relationship IDs that point to slide layouts
-                valid_layout_rids = set()
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "slideLayout" in rel_type:
-                        valid_layout_rids.add(rel.get("Id"))
+                valid_layout_rids = {
+                    rel.id
+                    for rel in self._relationships(rels_file)
+                    if "slideLayout" in rel.type
+                }
 
                 # Find all sldLayoutId elements in the slide master
                 for sld_layout_id in root.findall(
@@ -177,15 +182,16 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
                     if r_id and r_id not in valid_layout_rids:
                         errors.append(
-                            f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                            f"Line {sld_layout_id.sourceline}: sldLayoutId with id='{layout_id}' "
-                            f"references r:id='{r_id}' which is not found in slide layout relationships"
+                            self._finding(
+                                f"sldLayoutId with id='{layout_id}' "
+                                f"references r:id='{r_id}' which is not found in slide layout relationships",
+                                slide_master,
+                                sld_layout_id.sourceline,
+                            )
                         )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {slide_master.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._finding(f"Error: {e}", slide_master))
 
         if errors:
             print(f"FAILED - Found {len(errors)} slide layout ID validation errors:")
@@ -202,33 +208,27 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate_no_duplicate_slide_layouts(self):
         """Validate that each slide has exactly one slideLayout reference."""
-        import lxml.etree
-
         errors = []
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        slide_rels_files = self._part_files("ppt/slides/_rels/*.xml.rels")
 
-        for rels_file in slide_rels_files:
+        for rels_file in self._profiled(slide_rels_files):
             try:
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Find all slideLayout relationships
                 layout_rels = [
                     rel
-                    for rel in root.findall(
-                        f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                    )
-                    if "slideLayout" in rel.get("Type", "")
+                    for rel in self._relationships(self._member_name(rels_file))
+                    if "slideLayout" in rel.type
                 ]
 
                 if len(layout_rels) > 1:
                     errors.append(
-                        f"  {rels_file.relative_to(self.unpacked_dir)}: has {len(layout_rels)} slideLayout references"
+                        self._finding(
+                            f"has {len(layout_rels)} slideLayout references", rels_file
+                        )
                     )
 
             except Exception as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._finding(f"Error: {e}", rels_file))
 
         if errors:
             print("FAILED - Found slides with duplicate slideLayout references:")
@@ -242,67 +242,60 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate_notes_slide_references(self):
         """Validate that each notesSlide file is referenced by only one slide."""
-        import lxml.etree
-
         errors = []
         notes_slide_references = {}  # Track which slides reference each notesSlide
 
         # Find all slide relationship files
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        slide_rels_files = self._part_files("ppt/slides/_rels/*.xml.rels")
 
         if not slide_rels_files:
             if self.verbose:
                 print("PASSED - No slide relationship files found")
             return True
 
-        for rels_file in slide_rels_files:
+        for rels_file in self._profiled(slide_rels_files):
             try:
-                # Parse the relationships file
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Find all notesSlide relationships
-                for rel in root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "notesSlide" in rel_type:
-                        target = rel.get("Target", "")
-                        if target:
-                            # Normalize the target path to handle relative paths
-                            normalized_target = target.replace("../", "")
-
-                            # Track which slide references this notesSlide
-                            slide_name = rels_file.stem.replace(
-                                ".xml", ""
-                            )  # e.g., "slide1"
-
-                            if normalized_target not in notes_slide_references:
-                                notes_slide_references[normalized_target] = []
-                            notes_slide_references[normalized_target].append(
-                                (slide_name, rels_file)
-                            )
+                for rel in self._relationships(self._member_name(rels_file)):
+                    # rel.part is the resolved member name, so different
+                    # relative spellings of one target are counted together
+                    if "notesSlide" in rel.type and rel.part:
+                        # Track which slide references this notesSlide
+                        slide_name = rels_file.stem.replace(
+                            ".xml", ""
+                        )  # e.g., "slide1"
+
+                        if rel.part not in notes_slide_references:
+                            notes_slide_references[rel.part] = []
+                        notes_slide_references[rel.part].append(
+                            (slide_name, rels_file)
+                        )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(self._finding(f"Error: {e}", rels_file))
 
         # Check for duplicate references
         for target, references in notes_slide_references.items():
             if len(references) > 1:
                 slide_names = [ref[0] for ref in references]
                 errors.append(
-                    f"  Notes slide '{target}' is referenced by multiple slides: {', '.join(slide_names)}"
+                    self._finding(
+                        f"Notes slide '{target}' is referenced by multiple slides: {', '.join(slide_names)}",
+                        detail="\n".join(
+                            f"    - {self._member_name(rels_file)}"
+                            for slide_name, rels_file in references
+                        ),
+                    )
                 )
-                for slide_name, rels_file in references:
-                    errors.append(f"    - {rels_file.relative_to(self.unpacked_dir)}")
 
         if errors:
             print(
-                f"FAILED - Found {len([e for e in errors if not e.startswith('    ')])} notes slide reference validation errors:"
+                f"FAILED - Found {len(errors)} notes slide reference validation errors:"
             )
             for error in errors:
                 print(error)
+                if error.detail:
+                    print(error.detail)
             print("Each slide may optionally have its own slide file.")
             return False
         else:
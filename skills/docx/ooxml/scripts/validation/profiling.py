@@ -0,0 +1,103 @@
+"""
+Wall time and bytes parsed per validation rule and part, for finding slow checks.
+"""
+
+import contextlib
+import json
+import os
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class Span:
+    """Time spent by a rule as a whole (part is None) or on one part."""
+
+    rule: str
+    part: str | None
+    start: float  # time.perf_counter() when the span began
+    seconds: float = 0.0
+    bytes: int = 0  # Size of the parts parsed during the span
+
+
+class ValidationProfiler:
+    """Spans of one or more validators, reported as a slowest-parts table or a trace.
+
+    Pass the same profiler to every validator run on a document, like a
+    ValidationReport. Spans nest: a part's span lies within its rule's, and
+    bytes parsed count towards every span open at the time.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._open_spans = []
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, rule, part=None):
+        """Time the block as work of rule on part (or on the package as a whole)."""
+        span = Span(rule=rule, part=part, start=time.perf_counter())
+        self._open_spans.append(span)
+        try:
+            yield span
+        finally:
+            span.seconds = time.perf_counter() - span.start
+            self._open_spans.remove(span)
+            self.spans.append(span)
+
+    def add_bytes(self, count):
+        """Count count bytes as parsed by the open spans."""
+        for span in self._open_spans:
+            span.bytes += count
+
+    def slowest_parts(self, count=10):
+        """Return the count slowest (rule, part, seconds, bytes), slowest first.
+
+        Spans of the same rule and part are added up.
+        """
+        totals = {}
+        for span in self.spans:
+            if span.part is None:
+                continue
+            key = (span.rule, span.part)
+            seconds, parsed = totals.get(key, (0.0, 0))
+            totals[key] = (seconds + span.seconds, parsed + span.bytes)
+        slowest = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+        return [(rule, part, s, b) for (rule, part), (s, b) in slowest[:count]]
+
+    def format_slowest_parts(self, count=10):
+        """Return the slowest parts as a table, one line per (rule, part)."""
+        lines = [f"Slowest {count} rule/part pairs:"]
+        for rule, part, seconds, parsed in self.slowest_parts(count):
+            lines.append(
+                f"  {seconds * 1000:9.1f} ms {parsed / 1024:10.1f} KiB  {rule}  {part}"
+            )
+        return "\n".join(lines)
+
+    def to_chrome_trace(self):
+        """Return the spans as Chrome trace events, for chrome://tracing or Perfetto."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": span.part or span.rule,
+                    "cat": span.rule,
+                    "ph": "X",
+                    "ts": (span.start - self._origin) * 1e6,
+                    "dur": span.seconds * 1e6,
+                    "pid": pid,
+                    "tid": 0,
+                    "args": {"bytes": span.bytes},
+                }
+                for span in sorted(self.spans, key=lambda span: span.start)
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def save_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
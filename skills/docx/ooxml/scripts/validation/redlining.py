@@ -2,119 +2,252 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
-import zipfile
+import contextlib
+import time
+import xml.etree.ElementTree as ET
+from itertools import zip_longest
 from pathlib import Path
 
+from .diff import word_diff
+from .manifest import hash_bytes
+from .package import ZipPackage, open_package
+from .report import Finding, ValidationReport
+
+# Size of document.xml from which it is compared streaming rather than as trees
+STREAMING_THRESHOLD = 16 * 1024 * 1024
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_docx,
+        verbose=False,
+        original_package=None,
+        manifest=None,
+        report=None,
+        streaming=None,
+        authors=("Claude",),
+        profiler=None,
+    ):
+        # unpacked_dir may also be a zipped .docx, read without extracting it
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
+        self.package = open_package(self.unpacked_dir)
         self.verbose = verbose
+        self._original_package = original_package
+        self.manifest = manifest
+        self.report = report if report is not None else ValidationReport()
+        # Optional ValidationProfiler, timing the comparison of document.xml
+        self.profiler = profiler
+        # Compare paragraph by paragraph with iterparse instead of building both
+        # trees; None decides by the size of document.xml
+        self.streaming = streaming
+        # Authors whose tracked changes are validated
+        self.authors = frozenset(authors)
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
+        self._ins_tag = f"{{{self.namespaces['w']}}}ins"
+        self._del_tag = f"{{{self.namespaces['w']}}}del"
+        self._author_attr = f"{{{self.namespaces['w']}}}author"
+        self._deltext_tag = f"{{{self.namespaces['w']}}}delText"
+        self._t_tag = f"{{{self.namespaces['w']}}}t"
+
+    @property
+    def original_package(self):
+        """Read-only view of the original docx, opened on first use."""
+        if self._original_package is None:
+            self._original_package = ZipPackage(self.original_docx)
+        return self._original_package
 
     def validate(self):
         """Main validation method that returns True if valid, False otherwise."""
-        # Verify unpacked directory exists and has correct structure
-        modified_file = self.unpacked_dir / "word" / "document.xml"
-        if not modified_file.exists():
-            print(f"FAILED - Modified document.xml not found at {modified_file}")
+        start = time.perf_counter()
+        profile = contextlib.nullcontext()
+        if self.profiler is not None:
+            profile = self.profiler.span("redlining", "word/document.xml")
+        with profile:
+            passed = self._validate_incrementally()
+        self.report.record_rule("redlining", passed, time.perf_counter() - start)
+        return passed
+
+    def _validate_incrementally(self):
+        """Run _validate unless the manifest shows document.xml already passed."""
+        if self.manifest is None or "word/document.xml" not in self.package:
+            return self._validate()
+
+        # Skip if document.xml is unchanged since it last passed against this
+        # original, checking the same authors' changes
+        name = type(self).__name__
+        document_hash = hash_bytes(self.package.read("word/document.xml"))
+        authors = sorted(self.authors)
+        previous = self.manifest.previous(name, self.original_docx)
+        if (
+            previous.get("passed")
+            and previous.get("document") == document_hash
+            and previous.get("authors") == authors
+        ):
+            if self.verbose:
+                print("PASSED - document.xml unchanged since last validation")
+            return True
+
+        passed = self._validate()
+        self.manifest.record(name, self.original_docx).update(
+            document=document_hash, authors=authors, passed=passed
+        )
+        return passed
+
+    def _validate(self):
+        """Compare the text of both documents with the authors' tracked changes removed."""
+        # Verify the document has a main document part
+        modified_member = "word/document.xml"
+        if modified_member not in self.package:
+            modified_file = self.unpacked_dir / modified_member
+            self._fail(f"Modified document.xml not found at {modified_file}")
             return False
 
-        # First, check if there are any tracked changes by Claude to validate
+        streaming = self.streaming
+        if streaming is None:
+            streaming = self.package.size(modified_member) >= STREAMING_THRESHOLD
+
+        # First, check if there are any tracked changes by the authors to validate
+        modified_root = modified_index = None
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
-            # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
+            with self.package.open(modified_member) as modified_file:
+                if streaming:
+                    has_changes = self._has_tracked_changes(modified_file)
+                else:
+                    modified_root = ET.parse(modified_file).getroot()
+                    modified_index = self._index_tracked_changes(modified_root)
+                    has_changes = not self.authors.isdisjoint(modified_index)
+
+            # Redlining validation is only needed if the authors made tracked changes.
+            if not has_changes:
                 if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
+                    print(
+                        f"PASSED - No tracked changes by {self._authors_label()} found."
+                    )
                 return True
 
         except Exception:
             # If we can't parse the XML, continue with full validation
             pass
 
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
+        # Read the original document.xml straight from the docx
+        original_member = "word/document.xml"
+        try:
+            has_original = original_member in self.original_package
+        except Exception as e:
+            self._fail(f"Error reading original docx: {e}")
+            return False
+
+        if not has_original:
+            self._fail(f"Original document.xml not found in {self.original_docx}")
+            return False
+
+        if streaming:
+            return self._compare_streaming(modified_member, original_member)
+
+        # Parse both XML files using xml.etree.ElementTree for redlining validation,
+        # reusing the modified tree and its change index from the check above
+        try:
+            if modified_root is None:
+                with self.package.open(modified_member) as modified_file:
+                    modified_root = ET.parse(modified_file).getroot()
+            with self.original_package.open(original_member) as original_file:
                 original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+            original_root = original_tree.getroot()
+        except ET.ParseError as e:
+            self._fail(f"Error parsing XML files: {e}")
+            return False
 
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
+        # Remove the authors' tracked changes from both documents
+        self._remove_tracked_changes(original_root)
+        self._remove_tracked_changes(modified_root, modified_index)
+
+        # Extract and compare text content
+        modified_text = self._extract_text_content(modified_root)
+        original_text = self._extract_text_content(original_root)
+
+        if modified_text != original_text:
+            self._report_text_mismatch(original_text, modified_text)
+            return False
+
+        self._report_passed()
+        return True
+
+    def _compare_streaming(self, modified_member, original_member):
+        """Compare both documents paragraph by paragraph, without building either tree.
+
+        Only the text from the first differing paragraph onwards is kept, to
+        show the differences.
+        """
+        try:
+            with (
+                self.package.open(modified_member) as modified_file,
+                self.original_package.open(original_member) as original_file,
+            ):
+                modified = self._iter_paragraph_texts(modified_file)
+                original = self._iter_paragraph_texts(original_file)
+                for original_paragraph, modified_paragraph in zip_longest(
+                    original, modified
+                ):
+                    if original_paragraph != modified_paragraph:
+                        original_rest = [original_paragraph, *original]
+                        modified_rest = [modified_paragraph, *modified]
+                        break
+                else:
+                    self._report_passed()
+                    return True
+        except ET.ParseError as e:
+            self._fail(f"Error parsing XML files: {e}")
+            return False
+
+        self._report_text_mismatch(
+            "\n".join(p for p in original_rest if p is not None),
+            "\n".join(p for p in modified_rest if p is not None),
+        )
+        return False
+
+    def _report_text_mismatch(self, original_text, modified_text):
+        """Print the differences between both texts and add them to the report."""
+        # Show detailed character-level differences for each paragraph
+        error_message = self._generate_detailed_diff(original_text, modified_text)
+        print(error_message)
+        self.report.add(
+            Finding(
+                rule="redlining",
+                message="Document text doesn't match after removing tracked changes by "
+                + self._authors_label(),
+                part="word/document.xml",
+                detail=error_message,
+            )
+        )
+
+    def _report_passed(self):
+        if self.verbose:
+            print(
+                f"PASSED - All changes by {self._authors_label()} are properly tracked"
+            )
+
+    def _authors_label(self):
+        return ", ".join(sorted(self.authors))
+
+    def _fail(self, message):
+        """Print a failure and add it to the report."""
+        print(f"FAILED - {message}")
+        self.report.add(
+            Finding(rule="redlining", message=message, part="word/document.xml")
+        )
 
     def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+        """Generate the failure message, with a character diff of changed paragraphs."""
         error_parts = [
-            "FAILED - Document text doesn't match after removing Claude's tracked changes",
+            "FAILED - Document text doesn't match after removing tracked changes by "
+            + self._authors_label(),
             "",
             "Likely causes:",
             "  1. Modified text inside another author's <w:ins> or <w:del> tags",
@@ -127,129 +260,137 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
+        error_parts.extend(
+            ["Differences:", "============", word_diff(original_text, modified_text)]
+        )
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
+    def _is_tracked_change(self, elem):
+        """Return True if elem is a w:ins or w:del by one of the validated authors."""
+        return (
+            elem.tag in (self._ins_tag, self._del_tag)
+            and elem.get(self._author_attr) in self.authors
+        )
 
-        return None
+    def _index_tracked_changes(self, root):
+        """Map each author to their tracked changes, as (parent, w:ins or w:del) pairs.
 
-    def _remove_claude_tracked_changes(self, root):
-        """Remove tracked changes authored by Claude from the XML root."""
-        ins_tag = f"{{{self.namespaces['w']}}}ins"
-        del_tag = f"{{{self.namespaces['w']}}}del"
-        author_attr = f"{{{self.namespaces['w']}}}author"
+        Built in one walk over the tree, and used both to tell whether there is
+        anything to validate and to strip the changes.
+        """
+        index = {}
+        stack = [root]
+        while stack:
+            parent = stack.pop()
+            for child in parent:
+                if child.tag in (self._ins_tag, self._del_tag):
+                    author = child.get(self._author_attr)
+                    index.setdefault(author, []).append((parent, child))
+                stack.append(child)
+        return index
+
+    def _remove_tracked_changes(self, root, index=None):
+        """Remove tracked changes by the validated authors from the XML root.
+
+        Insertions are dropped and deletions unwrapped, their w:delText turned
+        back into w:t. Only the parents listed in the change index are touched,
+        each of them rebuilding its child list once.
+        """
+        if index is None:
+            index = self._index_tracked_changes(root)
+        changes = [
+            change for author in self.authors for change in index.get(author, [])
+        ]
 
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
+        def kept_children(parent):
+            """Yield each child of parent that remains, with deletions unwrapped."""
             for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
+                if not self._is_tracked_change(child):
+                    yield child
+                elif child.tag == self._del_tag:
+                    yield from kept_children(child)
 
-        # Unwrap content in w:del elements where author is "Claude"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
+        for parent in {parent: None for parent, _ in changes}:
+            parent[:] = list(kept_children(parent))
 
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
-
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
+        for _, change in changes:
+            if change.tag == self._del_tag:
+                for elem in change.iter(self._deltext_tag):
+                    elem.tag = self._t_tag
+
+    def _iterparse(self, source):
+        """Yield iterparse start/end events, discarding each element after its end.
+
+        Elements are detached from their parent once handled, so memory use
+        stays bounded by the nesting depth however long the document is.
+        """
+        open_elements = []
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                open_elements.append(elem)
+                yield event, elem
+                continue
+            yield event, elem
+            open_elements.pop()
+            if open_elements:
+                open_elements[-1].remove(elem)
+            elem.clear()
+
+    def _has_tracked_changes(self, source):
+        """Return True if a document has tracked changes by the validated authors.
+
+        Parsing stops at the first one.
+        """
+        return any(
+            event == "start" and self._is_tracked_change(elem)
+            for event, elem in self._iterparse(source)
+        )
+
+    def _iter_paragraph_texts(self, source):
+        """Yield the text of each non-empty paragraph, streaming the document.
+
+        Gives the same paragraphs as _extract_text_content after
+        _remove_tracked_changes: text in the authors' insertions is left out
+        and text in their deletions is kept.
+        """
+        p_tag = f"{{{self.namespaces['w']}}}p"
+
+        open_paragraphs = []  # (index in finished, text parts), outermost first
+        finished = []  # Texts of the current top-level paragraph and those in it
+        in_ins = 0  # Depth inside the authors' insertions, whose content is dropped
+        in_del = 0  # Depth inside their deletions, whose w:delText counts as text
+
+        for event, elem in self._iterparse(source):
+            is_change = self._is_tracked_change(elem)
+            if event == "start":
+                if is_change and elem.tag == self._ins_tag:
+                    in_ins += 1
+                elif is_change:
+                    in_del += 1
+                elif elem.tag == p_tag and not in_ins:
+                    open_paragraphs.append((len(finished), []))
+                    finished.append(None)
+                continue
+
+            if is_change and elem.tag == self._ins_tag:
+                in_ins -= 1
+            elif is_change:
+                in_del -= 1
+            elif in_ins:
+                continue
+            elif elem.tag == self._t_tag or (elem.tag == self._deltext_tag and in_del):
+                if elem.text:
+                    # Nested paragraphs' text is part of the enclosing ones too
+                    for _, parts in open_paragraphs:
+                        parts.append(elem.text)
+            elif elem.tag == p_tag:
+                index, parts = open_paragraphs.pop()
+                finished[index] = "".join(parts)
+                if not open_paragraphs:
+                    # Skip empty paragraphs - they don't affect content validation
+                    yield from (text for text in finished if text)
+                    finished.clear()
 
     def _extract_text_content(self, root):
         """Extract text content from Word XML, preserving paragraph structure.
@@ -0,0 +1,66 @@
+"""
+Machine-readable results of a validation run.
+"""
+
+import json
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class Finding:
+    """A single problem found by a validation rule."""
+
+    rule: str | None
+    message: str
+    part: str | None = None  # Package member the finding is about, if any
+    line: int | None = None
+    severity: str = "error"  # "error" or "warning"
+    detail: str | None = None  # Longer explanation, e.g. a text diff
+
+    def __str__(self):
+        """Format the finding the way validators print it."""
+        if self.part and self.line is not None:
+            return f"  {self.part}: Line {self.line}: {self.message}"
+        if self.part:
+            return f"  {self.part}: {self.message}"
+        return f"  {self.message}"
+
+
+class ValidationReport:
+    """Findings, rule outcomes and per-rule wall time of one or more validators.
+
+    Pass the same report to every validator run on a document to collect
+    their results in one place.
+    """
+
+    def __init__(self):
+        self.findings = []
+        self.rules = {}  # rule name -> {"passed": bool, "seconds": float}
+
+    def add(self, finding):
+        self.findings.append(finding)
+        return finding
+
+    def record_rule(self, rule, passed, seconds):
+        self.rules[rule] = {"passed": passed, "seconds": seconds}
+
+    @property
+    def passed(self):
+        """True if every rule passed and no error was reported."""
+        return all(r["passed"] for r in self.rules.values()) and not any(
+            f.severity == "error" for f in self.findings
+        )
+
+    def to_dict(self):
+        return {
+            "passed": self.passed,
+            "findings": [asdict(f) for f in self.findings],
+            "rules": self.rules,
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,80 @@
+"""
+Tree-less scan of XML parts, for checks that only need the root element.
+"""
+
+from dataclasses import dataclass
+from xml.parsers import expat
+
+# Bytes handed to expat at a time when stopping after the root element
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class PartRoot:
+    """The root element of a part, as far as the namespace checks need it."""
+
+    prefixes: frozenset  # Namespace prefixes declared on it, except the default
+    attributes: dict  # Attribute values by Clark-notation name, like lxml's attrib
+    well_formed: bool  # True if the whole part was read and is well-formed
+
+    @classmethod
+    def from_element(cls, root):
+        """Return the PartRoot of an already parsed lxml root element."""
+        return cls(
+            prefixes=frozenset(root.nsmap) - {None},
+            attributes=dict(root.attrib),
+            well_formed=True,
+        )
+
+
+def scan_part(source, stop_after_root=False):
+    """Scan the XML part in the binary file source and return its PartRoot.
+
+    Expat builds no tree and only calls back into Python for the root
+    element, so reading a whole part this way costs well under a full
+    lxml parse. With stop_after_root, reading stops right after the root's
+    start tag and nothing is known about the rest of the part.
+    Raises xml.parsers.expat.ExpatError if the part is not well-formed, and
+    ValueError or LookupError for encodings expat does not support.
+    """
+    parser = expat.ParserCreate(namespace_separator=" ")
+    prefixes = set()
+    attributes = None
+
+    def start_namespace(prefix, uri):
+        if prefix is not None:
+            prefixes.add(prefix)
+
+    def start_element(name, attrs):
+        nonlocal attributes
+        attributes = {_clark_name(key): value for key, value in attrs.items()}
+        # Declarations and elements below the root are of no interest
+        parser.StartNamespaceDeclHandler = None
+        parser.StartElementHandler = None
+
+    parser.StartNamespaceDeclHandler = start_namespace
+    parser.StartElementHandler = start_element
+
+    if stop_after_root:
+        while attributes is None:
+            chunk = source.read(CHUNK_SIZE)
+            parser.Parse(chunk, not chunk)
+            if not chunk:
+                break
+    else:
+        parser.ParseFile(source)
+    return PartRoot(
+        prefixes=frozenset(prefixes),
+        attributes=attributes or {},
+        well_formed=not stop_after_root,
+    )
+
+
+def _clark_name(name):
+    """Turn expat's "uri local" attribute name into lxml's "{uri}local"."""
+    uri, _, local = name.rpartition(" ")
+    return f"{{{uri}}}{local}" if uri else local
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
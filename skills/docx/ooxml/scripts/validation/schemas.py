@@ -0,0 +1,60 @@
+"""
+Compiled XSD schemas, loaded from the schemas tree on demand.
+"""
+
+import hashlib
+from pathlib import Path
+
+import lxml.etree
+
+SCHEMAS_DIR = Path(__file__).parent.parent.parent / "schemas"
+
+# Compiled XSD schemas keyed by resolved schema path. Compiling the large
+# WordprocessingML and PresentationML schemas costs far more than validating
+# a single part, so every validator in the process shares one compiled copy.
+_COMPILED_SCHEMAS = {}
+
+# Digest of every XSD source and the libxml2 version, computed on first use
+_schemas_digest = None
+
+
+def load_schema(schema_path):
+    """Return the compiled XMLSchema for schema_path, compiling it on first use."""
+    schema_path = Path(schema_path).resolve()
+    schema = _COMPILED_SCHEMAS.get(schema_path)
+    if schema is None:
+        schema = lxml.etree.XMLSchema(_parse_schema(schema_path))
+        _COMPILED_SCHEMAS[schema_path] = schema
+    return schema
+
+
+def schema_id(schema_path):
+    """Return a string identifying a schema and all its validation results depend on.
+
+    That is the schema's name, the contents of the whole schemas tree it may
+    import from, and the libxml2 version, which words the error messages.
+    """
+    global _schemas_digest
+    if _schemas_digest is None:
+        digest = hashlib.sha256(repr(lxml.etree.LIBXML_VERSION).encode())
+        for xsd_file in sorted(SCHEMAS_DIR.rglob("*.xsd")):
+            digest.update(xsd_file.relative_to(SCHEMAS_DIR).as_posix().encode())
+            digest.update(xsd_file.read_bytes())
+        _schemas_digest = digest.hexdigest()[:16]
+    schema_path = Path(schema_path).resolve()
+    if schema_path.is_relative_to(SCHEMAS_DIR.resolve()):
+        name = schema_path.relative_to(SCHEMAS_DIR.resolve()).as_posix()
+    else:
+        name = str(schema_path)
+    return f"{name}@{_schemas_digest}"
+
+
+def _parse_schema(schema_path):
+    """Parse a top-level XSD, resolving its imports relative to its path."""
+    with open(schema_path, "rb") as xsd_file:
+        parser = lxml.etree.XMLParser()
+        return lxml.etree.parse(xsd_file, parser=parser, base_url=str(schema_path))
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,356 @@
+"""
+Validator for Excel workbook XML files against XSD schemas.
+"""
+
+from pathlib import Path
+
+import lxml.etree
+
+from .base import BaseSchemaValidator
+from .package import rels_part
+
+
+class XLSXSchemaValidator(BaseSchemaValidator):
+    """Validator for Excel workbook XML files against XSD schemas.
+
+    Worksheets larger than STREAMING_THRESHOLD bytes are never held in memory as a
+    whole. The checks that work on parsed trees see a skeleton of the sheet,
+    with every row of sheetData dropped as it is parsed; rows never carry
+    relationship or unique IDs, so those checks lose nothing. The rows
+    themselves are XSD-validated in batches and their cells checked as they
+    stream past.
+    """
+
+    # SpreadsheetML namespace
+    SPREADSHEETML_NAMESPACE = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+    # Excel-specific element to relationship type mappings
+    ELEMENT_RELATIONSHIP_TYPES = {
+        "sheet": "sheet",  # worksheet, chartsheet or dialogsheet
+        "drawing": "drawing",
+        "legacydrawing": "vmldrawing",
+        "tablepart": "table",
+        "pivotcache": "pivotcachedefinition",
+    }
+
+    # Folders under xl/ whose parts are validated against the SpreadsheetML schema,
+    # like the parts directly in xl/
+    SPREADSHEETML_FOLDERS = {"worksheets", "chartsheets", "tables"}
+
+    # Size of a worksheet part from which it is streamed rather than parsed whole
+    STREAMING_THRESHOLD = 16 * 1024 * 1024
+
+    # Rows of a large worksheet validated against the schema at a time
+    ROWS_PER_BATCH = 10000
+
+    def validate(self):
+        """Run all validation checks and return True if all pass."""
+        # Test 0: XML well-formedness
+        if not self._run_rule(self.validate_xml):
+            return False
+
+        # Test 1: Namespace declarations
+        all_valid = True
+        if not self._run_rule(self.validate_namespaces):
+            all_valid = False
+
+        # Test 2: Unique IDs
+        if not self._run_rule(self.validate_unique_ids):
+            all_valid = False
+
+        # Test 3: Relationship and file reference validation
+        if not self._run_rule(self.validate_file_references):
+            all_valid = False
+
+        # Test 4: Content type declarations
+        if not self._run_rule(self.validate_content_types):
+            all_valid = False
+
+        # Test 5: XSD schema validation
+        if not self._run_rule(self.validate_against_xsd):
+            all_valid = False
+
+        # Test 6: Shared string and style references of cells
+        if not self._run_rule(self.validate_cell_references):
+            all_valid = False
+
+        # Test 7: Relationship ID reference validation
+        if not self._run_rule(self.validate_all_relationship_ids):
+            all_valid = False
+
+        return all_valid
+
+    def validate_cell_references(self):
+        """Validate that cells only reference shared strings and styles that exist."""
+        errors = []
+        shared_strings, styles = self._shared_strings_and_styles()
+
+        try:
+            string_count = self._count_shared_strings(shared_strings)
+            style_count = self._count_cell_styles(styles)
+        except lxml.etree.XMLSyntaxError:
+            return True  # Already reported by validate_xml
+
+        worksheets = self._part_files("xl/worksheets/*.xml")
+        sheets_to_check = self._parts_to_check("validate_cell_references", worksheets)
+        if sheets_to_check is not worksheets and any(
+            self.unpacked_dir / part in self._changed_parts
+            for part in (shared_strings, styles)
+            if part
+        ):
+            # Every sheet depends on the shared strings and styles
+            sheets_to_check = worksheets
+
+        cell_tag = f"{{{self.SPREADSHEETML_NAMESPACE}}}c"
+        value_tag = f"{{{self.SPREADSHEETML_NAMESPACE}}}v"
+        row_tag = f"{{{self.SPREADSHEETML_NAMESPACE}}}row"
+        for worksheet in self._profiled(sheets_to_check):
+            self._profile_parse(self.package, self._member_name(worksheet))
+            try:
+                with self.package.open(self._member_name(worksheet)) as source:
+                    for _, elem in lxml.etree.iterparse(
+                        source, events=("end",), tag=(cell_tag, row_tag)
+                    ):
+                        if elem.tag == row_tag:
+                            # Cells of the row are checked, drop it
+                            elem.clear()
+                            elem.getparent().remove(elem)
+                            continue
+
+                        reference = elem.get("r", "?")
+                        value = elem.findtext(value_tag)
+                        if elem.get("t") == "s" and value is not None:
+                            if not self._index_in_range(value, string_count):
+                                errors.append(
+                                    self._finding(
+                                        f"Cell {reference} references shared string "
+                                        f"{value} but {shared_strings or 'the workbook'} "
+                                        f"has {string_count or 0}",
+                                        worksheet,
+                                        elem.sourceline,
+                                    )
+                                )
+                        style = elem.get("s")
+                        if style is not None and style_count is not None:
+                            if not self._index_in_range(style, style_count):
+                                errors.append(
+                                    self._finding(
+                                        f"Cell {reference} uses style {style} but "
+                                        f"{styles} has {style_count} cell formats",
+                                        worksheet,
+                                        elem.sourceline,
+                                    )
+                                )
+            except lxml.etree.XMLSyntaxError:
+                continue  # Already reported by validate_xml
+
+        if errors:
+            print(f"FAILED - Found {len(errors)} invalid cell references:")
+            for error in errors:
+                print(error)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All cells reference existing shared strings and styles")
+            return True
+
+    @staticmethod
+    def _index_in_range(value, count):
+        try:
+            return 0 <= int(value) < (count or 0)
+        except ValueError:
+            return False
+
+    def _shared_strings_and_styles(self):
+        """Return the member names of the shared strings and styles parts.
+
+        The parts are found through the package and workbook relationships;
+        either is None if the workbook has none.
+        """
+        workbook = "xl/workbook.xml"
+        shared_strings = styles = None
+        try:
+            for rel in self._relationships("_rels/.rels"):
+                if rel.type.endswith("/officeDocument") and rel.part:
+                    workbook = rel.part
+            workbook_rels = rels_part(workbook)
+            if workbook_rels in self.package:
+                for rel in self._relationships(workbook_rels):
+                    if rel.type.endswith("/sharedStrings") and rel.part:
+                        shared_strings = rel.part
+                    elif rel.type.endswith("/styles") and rel.part:
+                        styles = rel.part
+        except (OSError, KeyError, lxml.etree.XMLSyntaxError):
+            pass  # Reported by validate_xml and validate_file_references
+        if shared_strings not in self.package:
+            shared_strings = None
+        if styles not in self.package:
+            styles = None
+        return shared_strings, styles
+
+    def _count_shared_strings(self, shared_strings):
+        """Return the number of strings in the shared string table, streaming it."""
+        if shared_strings is None:
+            return None
+        count = 0
+        with self.package.open(shared_strings) as source:
+            for _, si in lxml.etree.iterparse(
+                source, events=("end",), tag=f"{{{self.SPREADSHEETML_NAMESPACE}}}si"
+            ):
+                count += 1
+                si.clear()
+                si.getparent().remove(si)
+        return count
+
+    def _count_cell_styles(self, styles):
+        """Return the number of cell formats (cellXfs) in the styles part."""
+        if styles is None:
+            return None
+        root = self._parse_xml(self.unpacked_dir / styles).getroot()
+        cell_xfs = root.find(f"{{{self.SPREADSHEETML_NAMESPACE}}}cellXfs")
+        if cell_xfs is None:
+            return 0
+        return len(cell_xfs.findall(f"{{{self.SPREADSHEETML_NAMESPACE}}}xf"))
+
+    def _get_schema_path(self, xml_file):
+        """Determine the appropriate schema path for an XML file."""
+        if (
+            xml_file.parent.name in self.SPREADSHEETML_FOLDERS
+            and xml_file.parent.parent.name == "xl"
+            and xml_file.suffix == ".xml"
+        ):
+            return self.schemas_dir / self.SCHEMA_MAPPINGS["xl"]
+        return super()._get_schema_path(xml_file)
+
+    def _is_streamed(self, package, member):
+        """Return True if member is a worksheet too large to parse whole."""
+        return (
+            member.startswith("xl/worksheets/")
+            and member.count("/") == 2
+            and member.endswith(".xml")
+            and member in package
+            and package.size(member) > self.STREAMING_THRESHOLD
+        )
+
+    def _parse_worksheet_skeleton(self, source):
+        """Parse a worksheet, dropping the rows of sheetData as they are parsed."""
+        context = lxml.etree.iterparse(
+            source, events=("end",), tag=f"{{{self.SPREADSHEETML_NAMESPACE}}}row"
+        )
+        for _, row in context:
+            row.clear()
+            row.getparent().remove(row)
+        return context.root.getroottree()
+
+    def _parse_xml(self, xml_file):
+        """Return the parsed tree of a part; a skeleton for large worksheets."""
+        xml_file = Path(xml_file)
+        member = self._member_name(xml_file)
+        if xml_file not in self._parsed_parts and self._is_streamed(
+            self.package, member
+        ):
+            self._profile_parse(self.package, member)
+            try:
+                with self.package.open(member) as source:
+                    tree = self._parse_worksheet_skeleton(source)
+            except lxml.etree.XMLSyntaxError as e:
+                tree = e
+            self._parsed_parts[xml_file] = tree
+        return super()._parse_xml(xml_file)
+
+    def _parse_original_xml(self, member):
+        """Return the parsed tree of an original part; a skeleton for large worksheets."""
+        if member not in self._parsed_original_parts and self._is_streamed(
+            self.original_package, member
+        ):
+            self._profile_parse(self.original_package, member)
+            try:
+                with self.original_package.open(member) as source:
+                    tree = self._parse_worksheet_skeleton(source)
+            except lxml.etree.XMLSyntaxError as e:
+                tree = e
+            self._parsed_original_parts[member] = tree
+        return super()._parse_original_xml(member)
+
+    def _row_xsd_errors(self, package, member, root, relative_path, schema_path):
+        """Validate the rows of a large worksheet in batches. Returns the error set.
+
+        Each batch is wrapped in a worksheet holding only sheetData, which the
+        schema accepts on its own, so together with the skeleton's errors this
+        gives the same errors as validating the whole sheet at once.
+        """
+        errors = set()
+        sheet_data_tag = f"{{{self.SPREADSHEETML_NAMESPACE}}}sheetData"
+
+        def new_batch():
+            worksheet = lxml.etree.Element(root.tag, nsmap=root.nsmap)
+            return worksheet, lxml.etree.SubElement(worksheet, sheet_data_tag)
+
+        self._profile_parse(package, member)
+        worksheet, sheet_data = new_batch()
+        rows = 0  # len() of an lxml element counts its children every time
+        with package.open(member) as source:
+            for _, row in lxml.etree.iterparse(
+                source, events=("end",), tag=f"{{{self.SPREADSHEETML_NAMESPACE}}}row"
+            ):
+                sheet_data.append(row)  # Moves the row out of the parsed tree
+                rows += 1
+                if rows == self.ROWS_PER_BATCH:
+                    errors |= self._validate_xml_doc_xsd(
+                        lxml.etree.ElementTree(worksheet),
+                        relative_path,
+                        schema_path,
+                        copy_tree=False,
+                    )[1]
+                    worksheet, sheet_data = new_batch()
+                    rows = 0
+        if rows:
+            errors |= self._validate_xml_doc_xsd(
+                lxml.etree.ElementTree(worksheet),
+                relative_path,
+                schema_path,
+                copy_tree=False,
+            )[1]
+        return errors
+
+    def _validate_single_file_xsd(self, xml_file, base_path):
+        """Validate a part against its XSD schema, large worksheets in batches."""
+        is_valid, errors = super()._validate_single_file_xsd(xml_file, base_path)
+        member = self._member_name(xml_file)
+        if is_valid is None or not self._is_streamed(self.package, member):
+            return is_valid, errors
+
+        try:
+            errors = errors | self._row_xsd_errors(
+                self.package,
+                member,
+                self._parse_xml(xml_file).getroot(),
+                xml_file.relative_to(base_path),
+                self._get_schema_path(xml_file),
+            )
+        except Exception as e:
+            errors = errors | {str(e)}
+        return not errors, errors
+
+    def _get_original_file_errors(self, xml_file):
+        """Get XSD errors of a part in the original, large worksheets in batches."""
+        member = Path(xml_file).resolve().relative_to(self.unpacked_dir).as_posix()
+        cached = member in self._original_xsd_errors
+        errors = super()._get_original_file_errors(xml_file)
+        if not cached and self._is_streamed(self.original_package, member):
+            # Extends the cached set in place, so the rows are validated once
+            try:
+                errors |= self._row_xsd_errors(
+                    self.original_package,
+                    member,
+                    self._parse_original_xml(member).getroot(),
+                    Path(member),
+                    self._get_schema_path(Path(xml_file)),
+                )
+            except Exception as e:
+                errors.add(str(e))
+        return errors
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,148 @@
+"""
+On-disk cache of XSD validation results, shared across documents and runs.
+"""
+
+import json
+import sqlite3
+import time
+from multiprocessing import util
+from pathlib import Path
+
+
+class XSDResultCache:
+    """XSD validation results keyed by schema and the hash of the validated part.
+
+    Documents made from one template share parts like styles.xml or slide
+    masters byte for byte, so their results can be looked up instead of
+    validating the part again. The key is the preprocessed part, as handed to
+    the schema, so parts that differ only in ignorable markup share a result.
+
+    Results are kept in an SQLite database, which the worker processes of a
+    batch can use at once. It holds at most max_entries results and drops
+    the least recently used ones beyond that. A database that cannot be read
+    or written only makes the cache miss; it never fails validation.
+    """
+
+    MAX_ENTRIES = 50000
+
+    # Results written between checks of the size bound
+    EVICT_EVERY = 100
+
+    def __init__(self, path, max_entries=MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        # None if the database cannot be opened, which leaves the cache disabled
+        self._connection = None
+        connection = None
+        try:
+            # Every statement commits on its own, so concurrent processes see
+            # each other's results and nothing is lost if a run is interrupted
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (schema TEXT, digest TEXT, "
+                "valid INTEGER, errors TEXT, used INTEGER, "
+                "PRIMARY KEY (schema, digest))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_used ON results (used)"
+            )
+            self._connection = connection
+        except sqlite3.Error:
+            if connection is not None:
+                connection.close()
+
+    def get(self, schema, digest):
+        """Return the cached (is_valid, errors) of a part, or None on a miss."""
+        row = None
+        try:
+            if self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT valid, errors FROM results WHERE schema = ? AND digest = ?",
+                    (schema, digest),
+                ).fetchone()
+            if row is not None:
+                self._connection.execute(
+                    "UPDATE results SET used = ? WHERE schema = ? AND digest = ?",
+                    (time.time_ns(), schema, digest),
+                )
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return bool(row[0]), set(json.loads(row[1]))
+
+    def put(self, schema, digest, is_valid, errors):
+        """Store the result of validating a part."""
+        if self._connection is None:
+            return
+        try:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (
+                    schema,
+                    digest,
+                    int(is_valid),
+                    json.dumps(sorted(errors)),
+                    time.time_ns(),
+                ),
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self.evict()
+        except sqlite3.Error:
+            pass  # The result is simply not cached
+
+    def evict(self):
+        """Drop the least recently used results beyond max_entries."""
+        if self._connection is None:
+            return
+        self._connection.execute(
+            "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results "
+            "ORDER BY used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    @property
+    def hit_rate(self):
+        """Fraction of lookups in this process that found a result (0 if none)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+    def close(self):
+        if self._connection is None:
+            return
+        try:
+            self.evict()
+        except sqlite3.Error:
+            pass
+        self._connection.close()
+        self._connection = None
+
+    def close_at_exit(self):
+        """Close the cache when this process exits, if it is still open.
+
+        Worker processes of a pool end without running atexit hooks, so this
+        uses multiprocessing's exit finalizers, which the main process runs
+        at exit as well.
+        """
+        util.Finalize(None, self.close, exitpriority=0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,703 @@
+import contextlib
+import io
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import lxml.etree
+
+from validation import (
+    DOCXSchemaValidator,
+    RedliningValidator,
+    ValidationManifest,
+    ValidationProfiler,
+    ValidationReport,
+    XLSXSchemaValidator,
+    XSDResultCache,
+)
+from validation.base import load_schema
+from validation.diff import word_diff
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+S_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PR_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/'
+    '2006/relationships/officeDocument" Target="word/document.xml"/>'
+    "</Relationships>"
+)
+
+
+def document_xml(body):
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'
+    )
+
+
+def paragraph(text):
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def write_package(root, body):
+    """Write a minimal unpacked docx whose document body is the given XML."""
+    root = Path(root)
+    (root / "_rels").mkdir(parents=True, exist_ok=True)
+    (root / "word").mkdir(parents=True, exist_ok=True)
+    (root / "[Content_Types].xml").write_text(CONTENT_TYPES, encoding="utf-8")
+    (root / "_rels" / ".rels").write_text(ROOT_RELS, encoding="utf-8")
+    (root / "word" / "document.xml").write_text(document_xml(body), encoding="utf-8")
+    return root
+
+
+def write_workbook(root, rows):
+    """Write a minimal unpacked xlsx whose only worksheet holds the given rows."""
+    spreadsheetml = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+    parts = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{spreadsheetml}.sheet.main+xml"/>'
+            f'<Override PartName="/xl/worksheets/sheet1.xml" ContentType="{spreadsheetml}.worksheet+xml"/>'
+            f'<Override PartName="/xl/sharedStrings.xml" ContentType="{spreadsheetml}.sharedStrings+xml"/>'
+            f'<Override PartName="/xl/styles.xml" ContentType="{spreadsheetml}.styles+xml"/>'
+            "</Types>"
+        ),
+        "_rels/.rels": (
+            f'<Relationships xmlns="{PR_NS}"><Relationship Id="rId1" '
+            f'Type="{R_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+        ),
+        "xl/workbook.xml": (
+            f'<workbook xmlns="{S_NS}" xmlns:r="{R_NS}"><sheets>'
+            '<sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            f'<Relationships xmlns="{PR_NS}">'
+            f'<Relationship Id="rId1" Type="{R_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+            f'<Relationship Id="rId2" Type="{R_NS}/sharedStrings" Target="sharedStrings.xml"/>'
+            f'<Relationship Id="rId3" Type="{R_NS}/styles" Target="styles.xml"/>'
+            "</Relationships>"
+        ),
+        "xl/worksheets/sheet1.xml": (
+            f'<worksheet xmlns="{S_NS}"><sheetData>{rows}</sheetData></worksheet>'
+        ),
+        "xl/sharedStrings.xml": (
+            f'<sst xmlns="{S_NS}" count="1" uniqueCount="1"><si><t>Hello</t></si></sst>'
+        ),
+        "xl/styles.xml": (
+            f'<styleSheet xmlns="{S_NS}"><fonts count="1"><font/></fonts>'
+            '<fills count="1"><fill/></fills><borders count="1"><border/></borders>'
+            '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+            "</cellXfs></styleSheet>"
+        ),
+    }
+    root = Path(root)
+    for name, content in parts.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(content, encoding="utf-8")
+    return root
+
+
+def legacy_preprocess_for_xsd(validator, xml_doc, relative_path):
+    """Preprocess a part the way validation did before _preprocess_for_xsd.
+
+    Each step copied the tree through a tostring/fromstring round trip.
+    """
+    root = lxml.etree.fromstring(lxml.etree.tostring(xml_doc))
+    for elem in root.iter():
+        if callable(elem.tag) or elem.tag.endswith("}t") or elem.tag == "t":
+            continue
+        for name in ["text", "tail"]:
+            if getattr(elem, name):
+                text = validator.TEMPLATE_TAG_PATTERN.sub("", getattr(elem, name))
+                setattr(elem, name, text)
+
+    root.attrib.pop(f"{{{validator.MC_NAMESPACE}}}Ignorable", None)
+    if relative_path.parts[0] not in validator.MAIN_CONTENT_FOLDERS:
+        return root
+
+    def is_foreign(name):
+        return name.startswith("{") and (
+            name[1:].partition("}")[0] not in validator.OOXML_NAMESPACES
+        )
+
+    root = lxml.etree.fromstring(lxml.etree.tostring(root))
+    for elem in root.iter():
+        for attr in [attr for attr in elem.attrib if is_foreign(attr)]:
+            del elem.attrib[attr]
+
+    def remove_foreign_elements(parent):
+        for elem in list(parent):
+            if callable(elem.tag):
+                continue
+            if is_foreign(elem.tag):
+                parent.remove(elem)
+            else:
+                remove_foreign_elements(elem)
+
+    remove_foreign_elements(root)
+    return root
+
+
+def zip_package(root, output_file):
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        for f in sorted(Path(root).rglob("*")):
+            if f.is_file():
+                zf.write(f, f.relative_to(root))
+    return output_file
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestDOCXSchemaValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+
+    def make_document(self, original_body, modified_body):
+        """Create an original .docx and an unpacked, modified copy of it."""
+        original_dir = write_package(self.root / "original", original_body)
+        original_file = zip_package(original_dir, self.root / "original.docx")
+        unpacked_dir = write_package(self.root / "unpacked", modified_body)
+        return unpacked_dir, original_file
+
+    def run_validator(self, validator_class, unpacked_dir, original_file, **options):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = validator_class(unpacked_dir, original_file, **options).validate()
+        return result, output.getvalue()
+
+    def test_unchanged_document_passes(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello")
+        )
+        for validator_class in [DOCXSchemaValidator, RedliningValidator]:
+            result, output = self.run_validator(
+                validator_class, unpacked_dir, original_file
+            )
+            self.assertTrue(result, output)
+
+    def test_new_xsd_error_fails(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello") + "<w:bogus/>"
+        )
+        result, output = self.run_validator(
+            DOCXSchemaValidator, unpacked_dir, original_file
+        )
+        self.assertFalse(result)
+        self.assertIn("word/document.xml: 1 new error(s)", output)
+
+    def test_report_collects_findings_and_rule_timings(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello") + "<w:bogus/>"
+        )
+        report = ValidationReport()
+        with contextlib.redirect_stdout(io.StringIO()):
+            DOCXSchemaValidator(unpacked_dir, original_file, report=report).validate()
+            RedliningValidator(unpacked_dir, original_file, report=report).validate()
+
+        self.assertFalse(report.passed)
+        self.assertFalse(report.rules["validate_against_xsd"]["passed"])
+        self.assertTrue(report.rules["redlining"]["passed"])
+        self.assertGreaterEqual(report.rules["validate_xml"]["seconds"], 0)
+        [finding] = report.findings
+        self.assertEqual(finding.rule, "validate_against_xsd")
+        self.assertEqual(finding.part, "word/document.xml")
+        self.assertIn("bogus", report.to_dict()["findings"][0]["message"])
+
+    def test_profiler_times_every_rule_and_part(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello") + "<w:bogus/>"
+        )
+        profiler = ValidationProfiler()
+        with contextlib.redirect_stdout(io.StringIO()):
+            DOCXSchemaValidator(
+                unpacked_dir, original_file, profiler=profiler
+            ).validate()
+
+        spans = {(span.rule, span.part): span for span in profiler.spans}
+        self.assertIn(("validate_against_xsd", None), spans)
+        document = spans[("validate_against_xsd", "word/document.xml")]
+        # The modified part was parsed by an earlier rule; only the original is
+        # parsed here, to tell new errors from existing ones
+        original_document = self.root / "original" / "word" / "document.xml"
+        self.assertEqual(document.bytes, original_document.stat().st_size)
+        slowest = profiler.slowest_parts(3)
+        self.assertEqual(len(slowest), 3)
+        self.assertEqual(slowest, sorted(slowest, key=lambda p: p[2], reverse=True))
+        events = profiler.to_chrome_trace()["traceEvents"]
+        self.assertEqual(len(events), len(profiler.spans))
+        self.assertTrue(all(event["ph"] == "X" for event in events))
+
+    def test_xsd_error_present_in_original_is_ignored(self):
+        body = paragraph("Hello") + "<w:bogus/>"
+        unpacked_dir, original_file = self.make_document(body, body)
+        result, output = self.run_validator(
+            DOCXSchemaValidator, unpacked_dir, original_file
+        )
+        self.assertTrue(result, output)
+
+    def test_redlining_validates_configured_authors(self):
+        tracked = (
+            '<w:p><w:del w:id="1" w:author="Agent"><w:r><w:delText>old</w:delText></w:r></w:del>'
+            '<w:ins w:id="2" w:author="Claude"><w:r><w:t>new</w:t></w:r></w:ins></w:p>'
+        )
+        unpacked_dir, original_file = self.make_document(paragraph("old"), tracked)
+        for streaming in [False, True]:
+            result, output = self.run_validator(
+                RedliningValidator,
+                unpacked_dir,
+                original_file,
+                streaming=streaming,
+                authors=["Agent", "Claude"],
+            )
+            self.assertTrue(result, output)
+            # Agent's deletion is someone else's change when only Claude is validated
+            result, output = self.run_validator(
+                RedliningValidator, unpacked_dir, original_file, streaming=streaming
+            )
+            self.assertFalse(result)
+            self.assertIn("tracked changes by Claude", output)
+
+    def test_zipped_document_is_validated_in_place(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello") + "<w:bogus/>"
+        )
+        modified_file = zip_package(unpacked_dir, self.root / "modified.docx")
+
+        result, output = self.run_validator(
+            DOCXSchemaValidator, modified_file, original_file
+        )
+        self.assertFalse(result)
+        self.assertIn("word/document.xml: 1 new error(s)", output)
+        for validator_class in [DOCXSchemaValidator, RedliningValidator]:
+            result, output = self.run_validator(
+                validator_class, original_file, original_file
+            )
+            self.assertTrue(result, output)
+
+    def test_redlining_strips_claude_changes(self):
+        tracked = (
+            "<w:p><w:r><w:t>Keep </w:t></w:r>"
+            '<w:del w:id="1" w:author="Claude"><w:r><w:delText>old</w:delText></w:r>'
+            '<w:ins w:id="2" w:author="Claude"><w:r><w:t>nested</w:t></w:r></w:ins></w:del>'
+            '<w:ins w:id="3" w:author="Claude"><w:r><w:t>new</w:t></w:r></w:ins>'
+            '<w:ins w:id="4" w:author="Other"><w:r><w:t> theirs</w:t></w:r></w:ins></w:p>'
+        )
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Keep old theirs"), tracked
+        )
+        for streaming in [False, True]:
+            result, output = self.run_validator(
+                RedliningValidator, unpacked_dir, original_file, streaming=streaming
+            )
+            self.assertTrue(result, output)
+
+        (unpacked_dir / "word" / "document.xml").write_text(
+            document_xml(tracked.replace("Keep", "Kept")), encoding="utf-8"
+        )
+        for streaming in [False, True]:
+            result, output = self.run_validator(
+                RedliningValidator, unpacked_dir, original_file, streaming=streaming
+            )
+            self.assertFalse(result)
+            self.assertIn("Ke[-e-]p{+t+} old theirs", output)
+
+    def test_broken_and_unreferenced_parts_are_reported(self):
+        unpacked_dir, original_file = self.make_document("", "")
+        # An absolute target, a missing one and an external one
+        rels = ROOT_RELS.replace('"word/document.xml"', '"/word/document.xml"')
+        rels = rels.replace(
+            "</Relationships>",
+            '<Relationship Id="rId2" Type="x" Target="docProps/app.xml"/>'
+            '<Relationship Id="rId3" Type="x" Target="https://example.com"'
+            ' TargetMode="External"/></Relationships>',
+        )
+        (unpacked_dir / "_rels" / ".rels").write_text(rels, encoding="utf-8")
+        (unpacked_dir / "word" / "media").mkdir()
+        (unpacked_dir / "word" / "media" / "image1.png").write_bytes(b"")
+
+        validator = DOCXSchemaValidator(unpacked_dir, original_file)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(validator.validate_file_references())
+        self.assertEqual(
+            [(f.part, f.message) for f in validator.report.findings],
+            [
+                ("_rels/.rels", "Broken reference to docProps/app.xml"),
+                ("word/media/image1.png", "Unreferenced file"),
+            ],
+        )
+
+    def test_schema_is_compiled_once(self):
+        validator = DOCXSchemaValidator(*self.make_document("", ""))
+        schema_path = validator._get_schema_path(
+            validator.unpacked_dir / "word" / "document.xml"
+        )
+        self.assertIs(load_schema(schema_path), load_schema(schema_path))
+
+    def test_parts_identical_to_original_skip_schema_compilation(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello")
+        )
+        validator = DOCXSchemaValidator(unpacked_dir, original_file)
+        with mock.patch("validation.base.load_schema") as load_schema:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertTrue(validator.validate_against_xsd())
+        load_schema.assert_not_called()
+
+    def test_parallel_xsd_validation_reports_the_same_findings(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello") + "<w:bogus/>"
+        )
+        (unpacked_dir / "_rels" / ".rels").write_text(
+            ROOT_RELS.replace("</Relationships>", "<Bogus/></Relationships>"),
+            encoding="utf-8",
+        )
+        (unpacked_dir / "word" / "styles.xml").write_text(
+            f'<w:styles xmlns:w="{W_NS}"><w:bogus/></w:styles>', encoding="utf-8"
+        )
+
+        findings = {}
+        for jobs in [1, 2]:
+            report = ValidationReport()
+            with contextlib.redirect_stdout(io.StringIO()):
+                DOCXSchemaValidator(
+                    unpacked_dir, original_file, jobs=jobs, report=report
+                ).validate()
+            findings[jobs] = [
+                (f.rule, f.part, f.line, f.message) for f in report.findings
+            ]
+
+        xsd_parts = {
+            part
+            for rule, part, _, _ in findings[1]
+            if rule == "validate_against_xsd"
+        }
+        self.assertGreaterEqual(len(xsd_parts), 2, findings[1])
+        self.assertEqual(findings[2], findings[1])
+
+    def test_cached_xsd_results_are_reused_across_documents(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello") + "<w:bogus/>"
+        )
+        with XSDResultCache(self.root / "xsd-cache.sqlite") as xsd_cache:
+            result, first_output = self.run_validator(
+                DOCXSchemaValidator, unpacked_dir, original_file, xsd_cache=xsd_cache
+            )
+            self.assertFalse(result)
+            self.assertEqual(xsd_cache.hits, 0)
+
+        with XSDResultCache(self.root / "xsd-cache.sqlite") as xsd_cache:
+            with mock.patch("validation.base.load_schema") as load_schema:
+                result, output = self.run_validator(
+                    DOCXSchemaValidator,
+                    unpacked_dir,
+                    original_file,
+                    xsd_cache=xsd_cache,
+                )
+            load_schema.assert_not_called()
+            self.assertFalse(result)
+            self.assertEqual(output, first_output)
+            self.assertEqual(xsd_cache.misses, 0)
+            self.assertEqual(xsd_cache.hit_rate, 1.0)
+
+    def test_unusable_xsd_cache_only_misses(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello") + "<w:bogus/>"
+        )
+        # A directory cannot be opened as a database
+        with XSDResultCache(self.root) as xsd_cache:
+            result, output = self.run_validator(
+                DOCXSchemaValidator, unpacked_dir, original_file, xsd_cache=xsd_cache
+            )
+            self.assertFalse(result)
+            self.assertIn("word/document.xml: 1 new error(s)", output)
+            self.assertEqual(xsd_cache.hits, 0)
+            self.assertGreater(xsd_cache.misses, 0)
+
+    def test_parallel_xsd_cache_lookups_are_counted(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello") + "<w:bogus/>"
+        )
+        (unpacked_dir / "word" / "styles.xml").write_text(
+            f'<w:styles xmlns:w="{W_NS}"><w:bogus/></w:styles>', encoding="utf-8"
+        )
+        lookups = {}
+        for run in ["cold", "warm"]:
+            with XSDResultCache(self.root / "xsd-cache.sqlite") as xsd_cache:
+                result, _ = self.run_validator(
+                    DOCXSchemaValidator,
+                    unpacked_dir,
+                    original_file,
+                    xsd_cache=xsd_cache,
+                    jobs=2,
+                )
+                self.assertFalse(result)
+                lookups[run] = (xsd_cache.hits, xsd_cache.misses)
+
+        self.assertEqual(lookups["cold"][0], 0)
+        self.assertGreaterEqual(lookups["cold"][1], 2)
+        self.assertEqual(lookups["warm"], (lookups["cold"][1], 0))
+
+    def test_single_pass_preprocessing_matches_the_step_by_step_one(self):
+        w14_ns = "http://schemas.microsoft.com/office/word/2010/wordml"
+        mc_ns = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+        body = (
+            '<w:p w14:paraId="1A2B3C4D">{{ intro }}<w:r><w:t>{{na</w:t></w:r>'
+            "<w:r><w:t>me}}</w:t></w:r>{{ tail }}<!-- {{ comment }} -->"
+            '<w:r w14:foo="x"><w:t>{{ kept }}</w:t></w:r>'
+            '<w14:extra w:val="1"><w:r><w:t>gone</w:t></w:r></w14:extra>after '
+            "{{ x }}</w:p><w:bogus/>"
+        )
+        xml = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{W_NS}" xmlns:w14="{w14_ns}" xmlns:mc="{mc_ns}"'
+            f' mc:Ignorable="w14 w15"><w:body>{body}</w:body></w:document>'
+        )
+        unpacked_dir, original_file = self.make_document(paragraph("Hello"), "")
+        (unpacked_dir / "word" / "document.xml").write_text(xml, encoding="utf-8")
+        (unpacked_dir / "docProps").mkdir()
+        (unpacked_dir / "docProps" / "custom.xml").write_text(xml, encoding="utf-8")
+
+        validator = DOCXSchemaValidator(unpacked_dir, original_file)
+        schema_path = validator._get_schema_path(unpacked_dir / "word" / "document.xml")
+        for member in ["word/document.xml", "docProps/custom.xml"]:
+            relative_path = Path(member)
+            xml_doc = validator._parse_xml(unpacked_dir / relative_path)
+            before = lxml.etree.tostring(xml_doc)
+
+            preprocessed = validator._preprocess_for_xsd(xml_doc, relative_path)
+            self.assertEqual(lxml.etree.tostring(xml_doc), before)
+            legacy = legacy_preprocess_for_xsd(validator, xml_doc, relative_path)
+            self.assertEqual(
+                lxml.etree.tostring(preprocessed.getroot()),
+                lxml.etree.tostring(legacy),
+            )
+
+            schema = load_schema(schema_path)
+            schema.validate(preprocessed)
+            findings = {error.message for error in schema.error_log}
+            schema.validate(legacy)
+            self.assertEqual(findings, {error.message for error in schema.error_log})
+            self.assertTrue(findings)
+
+    def test_checks_share_one_unmodified_parse(self):
+        mc_ns = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+        body = (
+            f'<mc:AlternateContent xmlns:mc="{mc_ns}"><mc:Fallback/></mc:AlternateContent>'
+            + paragraph("Hello")
+        )
+        validator = DOCXSchemaValidator(*self.make_document(body, body))
+        document = validator.unpacked_dir / "word" / "document.xml"
+        tree = validator._parse_xml(document)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            validator.validate()
+
+        self.assertIs(validator._parse_xml(document), tree)
+        self.assertEqual(len(tree.getroot()[0]), 2)
+
+    def test_xml_and_namespace_checks_build_no_trees(self):
+        unpacked_dir, original_file = self.make_document("", "")
+        (unpacked_dir / "word" / "document.xml").write_text(
+            document_xml(paragraph("Hello")).replace(
+                "<w:document ",
+                '<w:document xmlns:mc="http://schemas.openxmlformats.org/'
+                'markup-compatibility/2006" mc:Ignorable="w w14" ',
+            ),
+            encoding="utf-8",
+        )
+        validator = DOCXSchemaValidator(unpacked_dir, original_file)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertTrue(validator.validate_xml())
+            self.assertFalse(validator.validate_namespaces())
+
+        self.assertIn(
+            "Namespace 'w14' in Ignorable but not declared", output.getvalue()
+        )
+        self.assertNotIn("'w'", output.getvalue())
+        self.assertEqual(validator._parsed_parts, {})
+
+    def test_parts_in_encodings_expat_cannot_read_are_checked_with_lxml(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello")
+        )
+        (unpacked_dir / "word" / "document.xml").write_bytes(
+            document_xml(paragraph("你好"))
+            .replace('encoding="UTF-8"', 'encoding="GB2312"')
+            .encode("gb2312")
+        )
+        result, output = self.run_validator(
+            DOCXSchemaValidator, unpacked_dir, original_file
+        )
+        self.assertTrue(result, output)
+
+    def test_parse_errors_only_lxml_finds_are_reported(self):
+        unpacked_dir, original_file = self.make_document("", "")
+        # Well-formed for expat, but deeper than libxml2 parses by default
+        nested = "<w:sdt><w:sdtContent>" * 150 + "</w:sdtContent></w:sdt>" * 150
+        (unpacked_dir / "word" / "document.xml").write_text(
+            document_xml(nested), encoding="utf-8"
+        )
+        validator = DOCXSchemaValidator(unpacked_dir, original_file)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertTrue(validator._run_rule(validator.validate_xml))
+            self.assertFalse(validator._run_rule(validator.validate_unique_ids))
+
+        self.assertIn("FAILED - Found 1 XML violations", output.getvalue())
+        self.assertIn("Excessive depth", output.getvalue())
+
+    def test_incremental_run_only_revalidates_changed_parts(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello")
+        )
+        manifest = ValidationManifest(self.root / "validation.json")
+        validator = DOCXSchemaValidator(unpacked_dir, original_file, manifest=manifest)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(validator.validate())
+        manifest.save()
+
+        (unpacked_dir / "word" / "document.xml").write_text(
+            document_xml(paragraph("Hello") + "<w:bogus/>"), encoding="utf-8"
+        )
+        manifest = ValidationManifest(self.root / "validation.json")
+        validator = DOCXSchemaValidator(unpacked_dir, original_file, manifest=manifest)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertFalse(validator.validate())
+
+        self.assertIn("word/document.xml: 1 new error(s)", output.getvalue())
+        parsed = {validator._member_name(f) for f in validator._parsed_parts}
+        self.assertNotIn("_rels/.rels", parsed)
+
+    def test_incremental_run_checks_content_types_of_changed_parts(self):
+        unpacked_dir, original_file = self.make_document(
+            paragraph("Hello"), paragraph("Hello")
+        )
+        styles_file = unpacked_dir / "word" / "styles.xml"
+        styles_file.write_text(f'<w:styles xmlns:w="{W_NS}"/>', encoding="utf-8")
+        manifest = ValidationManifest(self.root / "validation.json")
+        validator = DOCXSchemaValidator(unpacked_dir, original_file, manifest=manifest)
+        with contextlib.redirect_stdout(io.StringIO()):
+            validator.validate()
+        rules = manifest.sections["DOCXSchemaValidator"]["rules"]
+        self.assertTrue(rules["validate_content_types"])
+        manifest.save()
+
+        # Same members and declarations, but a root needing an Override now
+        styles_file.write_text(document_xml(""), encoding="utf-8")
+        manifest = ValidationManifest(self.root / "validation.json")
+        validator = DOCXSchemaValidator(unpacked_dir, original_file, manifest=manifest)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertFalse(validator.validate())
+        self.assertIn(
+            "word/styles.xml: File with <document> root not declared", output.getvalue()
+        )
+
+    def test_incremental_redlining_is_not_reused_for_other_authors(self):
+        tracked = (
+            '<w:p><w:del w:id="1" w:author="Agent"><w:r><w:delText>old</w:delText></w:r></w:del>'
+            '<w:ins w:id="2" w:author="Claude"><w:r><w:t>new</w:t></w:r></w:ins></w:p>'
+        )
+        unpacked_dir, original_file = self.make_document(paragraph("old"), tracked)
+        for authors, expected in [(["Agent", "Claude"], True), (["Claude"], False)]:
+            manifest = ValidationManifest(self.root / "validation.json")
+            result, output = self.run_validator(
+                RedliningValidator,
+                unpacked_dir,
+                original_file,
+                manifest=manifest,
+                authors=authors,
+            )
+            manifest.save()
+            self.assertEqual(result, expected, output)
+
+
+class TestXLSXSchemaValidator(unittest.TestCase):
+
+    ROW = '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" s="0"><v>1</v></c></row>'
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+
+    def run_validator(self, unpacked_dir, original_file, streaming_threshold):
+        validator = XLSXSchemaValidator(unpacked_dir, original_file)
+        validator.STREAMING_THRESHOLD = streaming_threshold
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = validator.validate()
+        return result, output.getvalue()
+
+    def test_streamed_and_parsed_worksheets_report_the_same_errors(self):
+        original_dir = write_workbook(self.root / "original", self.ROW)
+        original_file = zip_package(original_dir, self.root / "original.xlsx")
+        unpacked_dir = write_workbook(
+            self.root / "unpacked",
+            self.ROW + '<row r="2"><c r="A2" t="s"><v>5</v></c>'
+            '<c r="B2" s="3" bogus="1"><v>1</v></c></row>',
+        )
+
+        outputs = []
+        for streaming_threshold in [XLSXSchemaValidator.STREAMING_THRESHOLD, 0]:
+            result, output = self.run_validator(
+                original_dir, original_file, streaming_threshold
+            )
+            self.assertTrue(result, output)
+            result, output = self.run_validator(
+                unpacked_dir, original_file, streaming_threshold
+            )
+            self.assertFalse(result)
+            self.assertIn("xl/worksheets/sheet1.xml: 1 new error(s)", output)
+            self.assertIn("bogus", output)
+            self.assertIn("Cell A2 references shared string 5", output)
+            self.assertIn("Cell B2 uses style 3", output)
+            outputs.append(output)
+        self.assertEqual(outputs[0], outputs[1])
+
+
+class TestWordDiff(unittest.TestCase):
+
+    def test_only_changed_paragraphs_are_shown(self):
+        original = "Hello world\nSame line\nThe quick brown fox\nremoved\nlast line"
+        modified = "Hello there world\nSame line\nThe quick red fox\nlast line!\nadded"
+        self.assertEqual(
+            word_diff(original, modified).split("\n"),
+            [
+                "Hello {+there +}world",
+                "The quick [-b-]r[-own-]{+ed+} fox",
+                "[-removed-]",
+                "last line{+!+}",
+                "{+added+}",
+            ],
+        )
+
+    def test_identical_texts_have_no_diff(self):
+        self.assertEqual(word_diff("a\nb", "a\nb"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
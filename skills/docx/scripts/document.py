@@ -36,6 +36,8 @@ from pathlib import Path
 from defusedxml import minidom
 from ooxml.scripts.pack import pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.manifest import ValidationManifest
+from ooxml.scripts.validation.package import ZipPackage
 from ooxml.scripts.validation.redlining import RedliningValidator
 
 from .utilities import XMLEditor
@@ -842,19 +844,36 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
-        # Create validators with current state
-        schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
-        redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
+        # Results of earlier validations in this session, so parts that haven't
+        # changed since then are not validated again
+        manifest = ValidationManifest(Path(self.temp_dir) / "validation.json")
+
+        with ZipPackage(self.original_docx) as original_package:
+            # Create validators with current state, sharing the original docx
+            schema_validator = DOCXSchemaValidator(
+                self.unpacked_path,
+                self.original_docx,
+                verbose=False,
+                original_package=original_package,
+                manifest=manifest,
+            )
+            redlining_validator = RedliningValidator(
+                self.unpacked_path,
+                self.original_docx,
+                verbose=False,
+                original_package=original_package,
+                manifest=manifest,
+                authors=[self.author],
+            )
 
-        # Run validations
-        if not schema_validator.validate():
-            raise ValueError("Schema validation failed")
-        if not redlining_validator.validate():
-            raise ValueError("Redlining validation failed")
+            # Run validations
+            try:
+                if not schema_validator.validate():
+                    raise ValueError("Schema validation failed")
+                if not redlining_validator.validate():
+                    raise ValueError("Redlining validation failed")
+            finally:
+                manifest.save()
 
     def save(self, destination=None, validate=True) -> None:
         """
@@ -10,6 +10,7 @@ Example:
     python utils/package_skill.py skills/public/my-skill ./dist
 """
 
+import os
 import sys
 import zipfile
 from pathlib import Path
@@ -66,13 +67,17 @@ def package_skill(skill_path, output_dir=None):
     # Create the .skill file (zip format)
     try:
         with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
+            # Walk through the skill directory, following symlinked folders
+            # (e.g. a library shared with another skill) so their files are included
+            for dirpath, dirnames, filenames in os.walk(skill_path, followlinks=True):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    file_path = Path(dirpath) / filename
+                    if file_path.is_file():
+                        # Calculate the relative path within the zip
+                        arcname = file_path.relative_to(skill_path.parent)
+                        zipf.write(file_path, arcname)
+                        print(f"  Added: {arcname}")
 
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
         return skill_filename